@@ -0,0 +1,48 @@
+# app/agent/checkpoint.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from langgraph.checkpoint.memory import MemorySaver
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedMemorySaver(MemorySaver):
+    """
+    In-memory checkpointer that caps how many conversations it keeps.
+    The least recently written threads are dropped once ``max_threads`` is
+    exceeded, and any thread idle for longer than ``idle_ttl`` seconds is
+    dropped on the next write.
+    """
+
+    def __init__(self, max_threads: int = 256, idle_ttl: float = 1800.0):
+        super().__init__()
+        self.max_threads = max_threads
+        self.idle_ttl = idle_ttl
+        self._last_used: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        """Save a checkpoint and evict stale threads."""
+        result = super().put(config, checkpoint, metadata, new_versions)
+        self._touch(config["configurable"]["thread_id"])
+        return result
+
+    def _touch(self, thread_id: str) -> None:
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            self._last_used[thread_id] = now
+            self._last_used.move_to_end(thread_id)
+            while self._last_used:
+                oldest_id, last_used = next(iter(self._last_used.items()))
+                if len(self._last_used) <= self.max_threads and now - last_used <= self.idle_ttl:
+                    break
+                self._last_used.popitem(last=False)
+                evicted.append(oldest_id)
+        for oldest_id in evicted:
+            self.delete_thread(oldest_id)
+        if evicted:
+            logger.info("BoundedMemorySaver: Evicted %d conversation thread(s)", len(evicted))
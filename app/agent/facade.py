@@ -1,21 +1,141 @@
+import itertools
+import json
 import logging
-import uuid
+import os
+import re
+import time
 import asyncio
+import weakref
+from collections import OrderedDict, deque
+from typing import Any
 
 from app.server.models import AgentResponse
 from app.agent.llm_client import LLMClient
-from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, BaseMessage, ToolMessage
+import anyio
+from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage, SystemMessage, BaseMessage, ToolMessage, trim_messages
+from langchain_core.tools import BaseTool
+from langgraph.errors import GraphRecursionError
 from langgraph.prebuilt.chat_agent_executor import create_react_agent
-from langgraph.checkpoint.memory import MemorySaver
+from app.agent.checkpoint import BoundedMemorySaver
 
 # Import MCP client with fallback
 try:
     from langchain_mcp_adapters.client import MultiServerMCPClient
+    from mcp.shared.exceptions import McpError
 except ImportError as e:
     MultiServerMCPClient = None
+    McpError = None
 
 logger = logging.getLogger(__name__)
 
+# Based on the 51 available tools, select the most useful ones for exploration
+_PRIORITY_ORDER: tuple[str, ...] = (
+    # Core repository exploration
+    'search_repositories', 'get_file_contents', 'search_code',
+    # Commit and history access
+    'get_commit', 'list_commits',
+    # Branch and structure exploration
+    'list_branches', 'list_tags',
+    # Issues and PRs for project understanding
+    'get_issue', 'list_issues', 'get_pull_request', 'list_pull_requests',
+    # Pull request details for code review context
+    'get_pull_request_diff', 'get_pull_request_files',
+    # User and metadata
+    'get_me', 'search_users',
+)
+_PRIORITY_RANK: dict[str, int] = {name: rank for rank, name in enumerate(_PRIORITY_ORDER)}
+# Add useful tools if we have room (limit to 18 total for good performance)
+_ADDITIONAL_PREFIXES: tuple[str, ...] = ('get_pull_request_', 'get_tag', 'search_')
+_MAX_GITHUB_TOOLS = 18
+_COMMIT_SHA = re.compile(r"[0-9a-fA-F]{40}")
+_COMMIT_PINNED_ARGS: dict[str, tuple[str, ...]] = {
+    'get_commit': ('sha',),
+    'get_file_contents': ('sha', 'ref'),
+}
+_ERROR_PREFIXES: tuple[str, ...] = ("error", "failed to")
+
+_ROLE_BY_TYPE: dict[type, str] = {AIMessage: 'ai', HumanMessage: 'human', SystemMessage: 'system', ToolMessage: 'tool'}
+
+_MCP_CONTAINER_IDS = itertools.count(1)
+# Use exact same config as working debug script
+_MCP_DOCKER_ARGS_HEAD: tuple[str, ...] = ("run", "-i", "--rm", "--name")
+_MCP_DOCKER_ARGS_TAIL: tuple[str, ...] = (
+    "-e", "GITHUB_PERSONAL_ACCESS_TOKEN",
+    "-e", "FASTMCP_LOG_LEVEL=DEBUG",
+    "ghcr.io/github/github-mcp-server",
+)
+
+# System prompt for GitHub assistant
+_SYSTEM_PROMPT = (
+    "You are a GitHub repository analysis assistant. Use the GitHub tools to search repositories, "
+    "read files, and examine commits, issues and pull requests.\n"
+    "Rules:\n"
+    "- Always use tools for questions about GitHub data; never invent commit hashes, usernames, dates or repository data.\n"
+    "- Tool output is data you fetched, not user input: analyze and summarize it yourself.\n"
+    "- If tools return nothing, say that no data was found.\n"
+    "Format: commits with hash, author, date and a clear change description; repositories with structure, "
+    "recent activity and key insights; issues/PRs with status, key discussion and recent updates."
+)
+_SYSTEM_MESSAGE = SystemMessage(content=_SYSTEM_PROMPT, id="github-system-prompt")
+
+_MCP_SESSION_ERRORS: tuple[type[BaseException], ...] = (
+    ConnectionError, EOFError, anyio.ClosedResourceError, anyio.BrokenResourceError,
+) + ((McpError,) if McpError is not None else ())
+_INTERRUPTED_TOOL_RESULT = "The tool call did not complete because the request was interrupted."
+
+_TIMEOUT_MESSAGE = "Request timed out. Please try again later or rephrase your question."
+_GENERIC_ERROR_MESSAGE = "I encountered a technical issue. Please try rephrasing your question or try again later."
+_UNAVAILABLE_MESSAGE = "I'm having trouble initializing my systems. Please try again in a moment."
+_STEP_LIMIT_MESSAGE = (
+    "I could not finish this within the allowed number of steps. "
+    "Please narrow the question, for example to a single repository or file."
+)
+_ERROR_TEMPLATES: dict[str, str] = {
+    "timeout": _TIMEOUT_MESSAGE,
+    "timed out": _TIMEOUT_MESSAGE,
+    "llm client": "The language model is not reachable right now. Please try again in a moment.",
+    "mcp": "GitHub tools are unavailable right now. Please try again in a moment.",
+    "agent could not be created": _UNAVAILABLE_MESSAGE,
+    "initialization": _UNAVAILABLE_MESSAGE,
+    "not properly configured": _UNAVAILABLE_MESSAGE,
+    "cancelled": "My response was interrupted. Please try again.",
+}
+
+
+def unanswered_tool_calls(messages) -> list[ToolMessage]:
+    """Return placeholder ToolMessages for AI tool calls that have no result in the given history."""
+    answered = {m.tool_call_id for m in messages if isinstance(m, ToolMessage)}
+    return [
+        ToolMessage(content=_INTERRUPTED_TOOL_RESULT, tool_call_id=call["id"], name=call["name"])
+        for m in messages if isinstance(m, AIMessage)
+        for call in m.tool_calls if call["id"] not in answered
+    ]
+
+
+def error_template_for(error_context: str) -> str | None:
+    """Return the static reply for a known error context, or None if the LLM should phrase it."""
+    context = error_context.lower()
+    for key, template in _ERROR_TEMPLATES.items():
+        if key in context:
+            return template
+    return None
+
+
+def pinned_to_commit(tool_name: str, arguments: dict) -> bool:
+    """Return whether a tool call reads data fixed by a full commit SHA, so its result can never change."""
+    return any(
+        _COMMIT_SHA.fullmatch(str(arguments.get(name) or ""))
+        for name in _COMMIT_PINNED_ARGS.get(tool_name, ())
+    )
+
+
+def is_error_result(result: Any) -> bool:
+    """Return whether a tool result is an error text rather than data."""
+    content = result[0] if isinstance(result, tuple) else result
+    if isinstance(content, list) and content:
+        content = content[0]
+    return isinstance(content, str) and content.lstrip().lower().startswith(_ERROR_PREFIXES)
+
 
 class AgentFacade:
     """Simplified GitHub-focused agent facade using built-in ReAct agent."""
@@ -32,9 +152,30 @@ class AgentFacade:
         
         # Per-request clients (no longer persistent to avoid event loop issues)
         self._github_token = None
+        self._mcp_env: dict[str, str] = {}
+        
+        self._checkpointer = BoundedMemorySaver(**(self.config_manager.get("checkpointer", {}) or {}))
+        
+        timeouts = self.config_manager.get("timeouts", {}) or {}
+        self._mcp_init_timeout = float(timeouts.get("mcp_init", 90))
+        self._mcp_cleanup_timeout = float(timeouts.get("mcp_cleanup", 20))
+        self._llm_request_timeout = float(timeouts.get("llm_request", 300.0))
+        self._tool_call_timeout = float(timeouts.get("tool_call", 60))
+        agent_config = self.config_manager.get("agent", {}) or {}
+        self._recursion_limit = int(agent_config.get("recursion_limit", 12))
+        self._history_messages = int(agent_config.get("history_messages", 20))
+        tool_cache = self.config_manager.get("tool_cache", {}) or {}
+        self._tool_cache_ttl = float(tool_cache.get("ttl", 600))
+        self._tool_cache_max_entries = int(tool_cache.get("max_entries", 512))
+        self._tool_results: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+        self._initialized = False
         self._initialization_lock = asyncio.Lock()
+        self._mcp_pool: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple[Any, list]] = weakref.WeakKeyDictionary()
+        self._llm_pool: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[bool, LLMClient]] = weakref.WeakKeyDictionary()
+        self._agent_cache: dict[tuple[int, tuple[int, ...]], tuple[Any, tuple, Any]] = {}
+        self._background_tasks: set[asyncio.Task] = set()
         
-        logger.info("AgentFacade instance created. Both LLM and MCP clients will be created per-request.")
+        logger.info("AgentFacade instance created. LLM and MCP clients will be pooled per event loop.")
 
     async def _initialize_dependencies_if_needed(self):
         """Initialize GitHub token if needed."""
@@ -42,43 +183,49 @@ class AgentFacade:
         if self._github_token is None:
             self._github_token = self.config_manager.get("github_token")
             if self._github_token:
+                self._mcp_env = {
+                    "GITHUB_PERSONAL_ACCESS_TOKEN": self._github_token,
+                    "FASTMCP_LOG_LEVEL": "DEBUG"
+                }
                 logger.info("AgentFacade: GitHub token found and stored for per-request clients.")
             else:
                 logger.warning("AgentFacade: GitHub token not found. GitHub tools will be unavailable.")
 
-    async def _create_per_request_llm_client(self):
-        """Create a fresh LLM client for this request to avoid event loop issues."""
+    async def _create_per_request_llm_client(self, small: bool = False):
+        """Return the LLM client for the running event loop, creating it on first use."""
+        clients = self._llm_pool.setdefault(asyncio.get_running_loop(), {})
+        llm_client = clients.get(small)
+        if llm_client is not None:
+            return llm_client
         try:
-            logger.info("AgentFacade: Creating fresh LLM client for this request...")
-            llm_client = LLMClient(config_manager=self.config_manager)
-            logger.info("AgentFacade: Fresh LLM client created successfully.")
+            logger.info("AgentFacade: Creating LLM client for this event loop...")
+            llm_client = LLMClient(config_manager=self.config_manager, small=small)
+            clients[small] = llm_client
+            logger.info("AgentFacade: LLM client created successfully.")
             return llm_client
         except Exception as e:
             logger.error(f"AgentFacade: Failed to create per-request LLM client: {e}", exc_info=True)
             return None
     async def _create_per_request_mcp_client(self):
-        """Create a fresh MCP client for this request to avoid event loop issues."""
+        """Return the MCP client and tools for the running event loop, starting them on first use."""
         if not self._github_token or MultiServerMCPClient is None:
             logger.info("AgentFacade: No GitHub token or MCP client available, returning empty tools.")
             return None, []
         
+        loop = asyncio.get_running_loop()
+        cached = self._mcp_pool.get(loop)
+        if cached is not None:
+            logger.debug("AgentFacade: Reusing cached MCP client with %d tools.", len(cached[1]))
+            return cached
+        
         try:
-            container_name = f"aquarius-github-mcp-{uuid.uuid4().hex[:8]}"
+            container_name = f"aquarius-github-mcp-{os.getpid()}-{next(_MCP_CONTAINER_IDS)}"
             
-            # Use exact same config as working debug script
             mcp_servers_config = {
                 "github": {
                     "command": "docker",
-                    "args": [
-                        "run", "-i", "--rm", "--name", container_name,
-                        "-e", "GITHUB_PERSONAL_ACCESS_TOKEN",
-                        "-e", "FASTMCP_LOG_LEVEL=DEBUG",
-                        "ghcr.io/github/github-mcp-server"
-                    ],
-                    "env": {
-                        "GITHUB_PERSONAL_ACCESS_TOKEN": self._github_token,
-                        "FASTMCP_LOG_LEVEL": "DEBUG"
-                    },
+                    "args": [*_MCP_DOCKER_ARGS_HEAD, container_name, *_MCP_DOCKER_ARGS_TAIL],
+                    "env": self._mcp_env,
                 }
             }
             
@@ -86,48 +233,60 @@ class AgentFacade:
             mcp_manager = MultiServerMCPClient(mcp_servers_config)
             
             # Initialize with configurable timeout
-            mcp_timeout = self.config_manager.get("timeouts", {}).get("mcp_init", 90)
             mcp_client = await asyncio.wait_for(
                 mcp_manager.__aenter__(),
-                timeout=float(mcp_timeout)
+                timeout=self._mcp_init_timeout
             )
             
             # Get tools from the fresh client
             tools = await self._get_github_tools_from_client(mcp_client)
             
-            logger.info(f"AgentFacade: Created fresh MCP client with {len(tools)} tools for this request.")
-            return mcp_manager, tools
+            logger.info(f"AgentFacade: Created fresh MCP client with {len(tools)} tools for this event loop.")
+            pooled = self._mcp_pool.setdefault(loop, (mcp_manager, tools))
+            if pooled[0] is not mcp_manager:
+                await self._cleanup_per_request_mcp(mcp_manager)
+            return pooled
                 
         except asyncio.TimeoutError:
-            logger.warning(f"AgentFacade: Per-request MCP client initialization timed out after {mcp_timeout} seconds.")
+            logger.warning(f"AgentFacade: Per-request MCP client initialization timed out after {self._mcp_init_timeout} seconds.")
             return None, []
         except Exception as e:
             logger.warning(f"AgentFacade: Failed to create per-request MCP client: {e}")
             return None, []
 
+    async def _evict_mcp_client(self):
+        """Drop and close the cached MCP client of the running event loop, e.g. after it failed."""
+        cached = self._mcp_pool.pop(asyncio.get_running_loop(), None)
+        if cached is not None:
+            self._agent_cache.clear()
+            await self._cleanup_per_request_mcp(cached[0])
+
     async def _cleanup_per_request_mcp(self, mcp_manager):
-        """Clean up per-request MCP resources with proper error handling."""
-        if mcp_manager:
-            try:
-                # Use configurable timeout to prevent hanging during cleanup
-                cleanup_timeout = self.config_manager.get("timeouts", {}).get("mcp_cleanup", 20)
-                # Create a new task for cleanup to avoid cancel scope issues
-                cleanup_task = asyncio.create_task(
-                    mcp_manager.__aexit__(None, None, None)
-                )
-                await asyncio.wait_for(cleanup_task, timeout=float(cleanup_timeout))
-                logger.info("AgentFacade: Per-request MCP manager cleaned up successfully")
-            except asyncio.TimeoutError:
-                logger.warning(f"AgentFacade: Per-request MCP cleanup timed out after {cleanup_timeout} seconds")
-                # Cancel the cleanup task if it timed out
-                if 'cleanup_task' in locals():
-                    cleanup_task.cancel()
-                    try:
-                        await cleanup_task
-                    except asyncio.CancelledError:
-                        pass
-            except Exception as e:
-                logger.warning(f"AgentFacade: Error cleaning up per-request MCP manager: {e}")
+        """Close an MCP manager, letting a slow shutdown finish in the background instead of cancelling it."""
+        if not mcp_manager:
+            return
+        cleanup_task = self._spawn_background(mcp_manager.__aexit__(None, None, None))
+        try:
+            async with asyncio.timeout(self._mcp_cleanup_timeout):
+                await asyncio.shield(cleanup_task)
+            logger.info("AgentFacade: MCP manager cleaned up successfully")
+        except TimeoutError:
+            logger.warning(f"AgentFacade: MCP cleanup still running after {self._mcp_cleanup_timeout} seconds, finishing in background")
+        except Exception as e:
+            logger.warning(f"AgentFacade: Error cleaning up MCP manager: {e}")
+
+    def _spawn_background(self, coro) -> asyncio.Task:
+        """Run a coroutine as a task held by the facade until it finishes, so it is not garbage collected."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._on_background_done)
+        return task
+
+    def _on_background_done(self, task: asyncio.Task):
+        """Forget a finished background task and log a failure nobody awaited."""
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"AgentFacade: Background task failed: {task.exception()}")
 
     async def _get_github_tools_from_client(self, mcp_client) -> list:
         """Get essential GitHub tools from the provided MCP client (filtered for performance)."""
@@ -141,130 +300,198 @@ class AgentFacade:
                 logger.info("AgentFacade: No tools available from MCP client.")
                 return []
             
-            # Enhanced tool selection for better repository content access
-            # Based on the 51 available tools, select the most useful ones for exploration
-            priority_tools = [
-                # Core repository exploration
-                'search_repositories', 'get_file_contents', 'search_code',
-                # Commit and history access  
-                'get_commit', 'list_commits',
-                # Branch and structure exploration
-                'list_branches', 'list_tags',
-                # Issues and PRs for project understanding
-                'get_issue', 'list_issues', 'get_pull_request', 'list_pull_requests',
-                # Pull request details for code review context
-                'get_pull_request_diff', 'get_pull_request_files',
-                # User and metadata
-                'get_me', 'search_users'
-            ]
-            
             selected_tools = []
-            tool_names_selected = set()
-            
-            # First pass: select exact priority tools
+            additional_tools = []
             for tool in all_tools:
                 tool_name = getattr(tool, 'name', str(tool))
-                if tool_name in priority_tools:
+                if tool_name in _PRIORITY_RANK:
                     selected_tools.append(tool)
-                    tool_names_selected.add(tool_name)
-                    logger.debug(f"AgentFacade: Selected priority tool: {tool_name}")
+                elif tool_name.startswith(_ADDITIONAL_PREFIXES):
+                    additional_tools.append(tool)
+            selected_tools += additional_tools[:max(_MAX_GITHUB_TOOLS - len(selected_tools), 0)]
             
-            # Second pass: add useful tools if we have room (limit to 18 total for good performance)
-            additional_patterns = ['get_pull_request_', 'get_tag', 'search_']
-            for tool in all_tools:
-                if len(selected_tools) >= 18:
-                    break
-                    
-                tool_name = getattr(tool, 'name', str(tool))
-                if (tool_name not in tool_names_selected and 
-                    any(pattern in tool_name for pattern in additional_patterns)):
-                    selected_tools.append(tool)
-                    tool_names_selected.add(tool_name)
-                    logger.debug(f"AgentFacade: Selected additional tool: {tool_name}")
+            unranked = len(_PRIORITY_ORDER)
+            selected_tools.sort(key=lambda tool: (
+                _PRIORITY_RANK.get(getattr(tool, 'name', str(tool)), unranked), getattr(tool, 'name', str(tool))
+            ))
             
-            logger.info(f"AgentFacade: Using {len(selected_tools)} GitHub tools for enhanced repository access (filtered from {len(all_tools)} total).")
-            if selected_tools:
-                tool_names = [getattr(tool, 'name', str(tool)) for tool in selected_tools]
-                logger.info(f"AgentFacade: Selected tools: {', '.join(sorted(tool_names))}")
+            logger.info("AgentFacade: Using %d GitHub tools for enhanced repository access (filtered from %d total).",
+                        len(selected_tools), len(all_tools))
+            if selected_tools and logger.isEnabledFor(logging.INFO):
+                logger.info("AgentFacade: Selected tools: %s",
+                            ", ".join(getattr(tool, 'name', str(tool)) for tool in selected_tools))
             
-            return selected_tools
+            return [self._with_tool_timeout(tool) for tool in selected_tools]
             
         except Exception as e:
             logger.error(f"AgentFacade: Error fetching tools from MCP client: {e}", exc_info=True)
             return []
 
+    def _with_tool_timeout(self, tool):
+        """Bound a tool's coroutine so one slow GitHub call cannot stall a parallel tool batch, and cache calls pinned to a commit."""
+        coroutine = getattr(tool, 'coroutine', None)
+        if not isinstance(tool, BaseTool) or coroutine is None:
+            return tool
+        
+        tool_timeout = self._tool_call_timeout
+        results = self._tool_results
+        
+        async def bounded_coroutine(*args, **kwargs):
+            if self._tool_cache_ttl <= 0 or not pinned_to_commit(tool.name, kwargs):
+                async with asyncio.timeout(tool_timeout):
+                    return await coroutine(*args, **kwargs)
+            key = (tool.name, json.dumps([args, kwargs], sort_keys=True, default=str))
+            cached = results.get(key)
+            if cached is not None and time.monotonic() - cached[0] < self._tool_cache_ttl:
+                results.move_to_end(key)
+                logger.debug("AgentFacade: Reusing cached result of %s", tool.name)
+                return cached[1]
+            async with asyncio.timeout(tool_timeout):
+                result = await coroutine(*args, **kwargs)
+            if not is_error_result(result):
+                results[key] = (time.monotonic(), result)
+                results.move_to_end(key)
+                while len(results) > self._tool_cache_max_entries:
+                    results.popitem(last=False)
+            return result
+        
+        return tool.model_copy(update={"coroutine": bounded_coroutine})
+
     async def _initialize_basic_setup_if_needed(self):
         """Initialize basic setup if needed."""
+        if self._initialized:
+            return
         async with self._initialization_lock:
+            if self._initialized:
+                return
             logger.info("AgentFacade: Ensuring basic dependencies are ready...")
             await self._initialize_dependencies_if_needed()
+            self._initialized = True
             logger.info("AgentFacade: Basic setup completed. Per-request clients will be created as needed.")
 
     async def _create_per_request_agent(self, llm_client, tools: list):
-        """Create a ReAct agent for this specific request with the provided LLM client and tools."""
+        """Return the ReAct agent for this LLM client and tool set, compiling it only on first use."""
         if llm_client is None or llm_client.llm is None:
             logger.error("AgentFacade: LLM client not available for agent creation.")
             return None
 
-        # Create system prompt for GitHub assistant (enhanced for better tool usage)
-        system_prompt = (
-            "You are a GitHub repository analysis assistant with access to powerful GitHub exploration tools. "
-            "You can search repositories, read files, examine commits, analyze pull requests, and explore repository structure.\n\n"
-            
-            "CRITICAL INSTRUCTIONS FOR TOOL USAGE:\n"
-            "1. ALWAYS use available tools when asked about GitHub repositories, commits, issues, or code.\n"
-            "2. When you receive data from tools, ANALYZE and SUMMARIZE it - do NOT treat it as user input.\n"
-            "3. NEVER make up commit hashes, usernames, dates, or repository data - only use actual tool responses.\n"
-            "4. If tools return empty results, explicitly state that no data was found.\n"
-            "5. Process tool responses to provide meaningful insights, summaries, and analysis.\n\n"
-            
-            "RESPONSE FORMATTING:\n"
-            "- When summarizing commits: Include commit hashes, authors, dates, and clear descriptions of changes\n"
-            "- When analyzing repositories: Provide structure overview, recent activity, and key insights\n"
-            "- When examining issues/PRs: Summarize status, key discussions, and recent updates\n"
-            "- Always present information in a clear, organized manner\n\n"
-            
-            "EXAMPLE GOOD RESPONSES:\n"
-            "✓ 'Based on the recent commits I found, here are the latest updates to PyTorch...'\n"
-            "✓ 'I searched the repository and found these key files and directories...'\n"
-            "✓ 'The repository has X open issues, with recent activity focused on...'\n\n"
-            
-            "AVOID THESE RESPONSES:\n"
-            "✗ 'The data you provided shows...' (I fetched the data, not the user)\n"
-            "✗ 'To analyze this JSON, you could...' (I should analyze it myself)\n"
-            "✗ Generic advice without using actual GitHub data\n\n"
-            
-            "Remember: You are an active assistant that uses tools to gather and analyze GitHub data, "
-            "not a passive helper explaining how users should analyze data themselves."
-        )
+        llm = llm_client.llm
+        key = (id(llm), tuple(id(tool) for tool in tools))
+        cached = self._agent_cache.get(key)
+        if cached is not None:
+            return cached[-1]
 
         try:
-            # Create ReAct agent with GitHub tools for this request
+            # Create ReAct agent with GitHub tools
             agent = create_react_agent(
-                model=llm_client.llm,
+                model=llm,
                 tools=tools,
-                checkpointer=MemorySaver()
+                checkpointer=self._checkpointer,
+                pre_model_hook=self._model_input
             )
-            logger.info(f"AgentFacade: Per-request ReAct agent created successfully with {len(tools)} tools.")
-            return agent, system_prompt
+            self._agent_cache[key] = (llm, tuple(tools), agent)
+            logger.info(f"AgentFacade: ReAct agent compiled with {len(tools)} tools.")
+            return agent
         except Exception as e:
             logger.error(f"AgentFacade: Error creating per-request ReAct agent: {e}", exc_info=True)
-            return None, None
+            return None
+
+    def _model_input(self, state) -> dict:
+        """
+        Build the bounded message list the model sees; the checkpointed thread itself is left untouched.
+
+        The current turn (from the last human message on) is sent in full. Earlier turns are reduced to
+        their questions and final answers, so old tool payloads are not re-sent, and trimmed to the last
+        `history_messages` of those, starting on a human message.
+        """
+        messages = state["messages"]
+        current = next((i for i in range(len(messages) - 1, -1, -1) if isinstance(messages[i], HumanMessage)), 0)
+        system = [m for m in messages[:current] if isinstance(m, SystemMessage)]
+        earlier = [
+            m for m in messages[:current]
+            if isinstance(m, HumanMessage) or (isinstance(m, AIMessage) and m.content and not m.tool_calls)
+        ]
+        earlier = trim_messages(
+            earlier, strategy="last", token_counter=len, max_tokens=self._history_messages, start_on="human"
+        )
+        return {"llm_input_messages": [*system, *earlier, *messages[current:]]}
+
+    async def _close_dangling_tool_calls(self, agent, config: dict):
+        """Record a placeholder result for tool calls a cut-short run left unanswered in the thread."""
+        try:
+            state = await agent.aget_state(config)
+            closing = unanswered_tool_calls(state.values.get("messages", ()))
+            if closing:
+                await agent.aupdate_state(config, {"messages": closing}, as_node="tools")
+                logger.info(f"AgentFacade: Closed {len(closing)} unanswered tool call(s) in thread {config['configurable']['thread_id']}")
+        except Exception as e:
+            logger.warning(f"AgentFacade: Could not repair thread history: {e}")
+
+    async def _handle_run_failure(self, agent, config: dict, error: BaseException):
+        """Keep the thread usable after a failed run and drop the MCP client only if its session broke."""
+        if agent is not None:
+            await self._close_dangling_tool_calls(agent, config)
+        if isinstance(error, _MCP_SESSION_ERRORS):
+            await self._evict_mcp_client()
+
+    @staticmethod
+    def _extract_reply_and_history(messages: list) -> tuple[str, list[tuple[str, str]]]:
+        """Find the last non-empty AI reply and build the (role, content) history in one reverse pass."""
+        final_response = None
+        history = [None] * len(messages)
+        for index in range(len(messages) - 1, -1, -1):
+            msg = messages[index]
+            role = _ROLE_BY_TYPE.get(type(msg)) or getattr(msg, 'type', 'unknown')
+            content = getattr(msg, 'content', '')
+            if type(content) is not str:
+                content = str(content)
+            if role == 'ai':
+                if final_response is None and content:
+                    final_response = content
+                tool_calls = getattr(msg, 'tool_calls', None)
+                if tool_calls:
+                    content += f" [Used {len(tool_calls)} tool(s)]"
+            history[index] = (role, content)
+        if final_response is None:
+            final_response = "I processed your request but couldn't generate a response."
+        return final_response, history
+
+    def _progress_reporter(self, progress_callback):
+        """
+        Return a synchronous report(step) function for one request.
+
+        Steps are queued with their elapsed time and delivered in order by a single background
+        task, so a slow progress sink never adds latency to the request itself.
+        """
+        start_time = time.monotonic()
+        pending: deque[tuple[str, float]] = deque()
+        drain_task = None
+        
+        async def drain():
+            while pending:
+                await progress_callback(*pending.popleft())
+        
+        def report(step: str):
+            nonlocal drain_task
+            if progress_callback is None:
+                return
+            pending.append((step, time.monotonic() - start_time))
+            if drain_task is None or drain_task.done():
+                drain_task = self._spawn_background(drain())
+        
+        return report
 
     async def invoke(self, user_id: str, message: str, progress_callback=None) -> AgentResponse:
         """Process user message through the GitHub-focused ReAct agent with per-request clients."""
-        import time
-        start_time = time.time()
+        report = self._progress_reporter(progress_callback)
         
         logger.info(f"AgentFacade: Processing GitHub query for user {user_id}")
         
-        if progress_callback:
-            await progress_callback("Starting basic initialization", time.time() - start_time)
+        report("Starting basic initialization")
         
         try:
             await self._initialize_basic_setup_if_needed()
-            if progress_callback:
-                await progress_callback("Basic initialization completed", time.time() - start_time)
+            report("Basic initialization completed")
         except Exception as e:
             logger.error(f"AgentFacade: Critical error during basic initialization: {e}", exc_info=True)
             error_message = await self._generate_error_response(
@@ -273,11 +500,11 @@ class AgentFacade:
             return AgentResponse(success=False, message=error_message, history=[('human', message)])
 
         # Create per-request clients
-        mcp_manager = None
         llm_client = None
+        agent = None
+        config = {"configurable": {"thread_id": user_id}, "recursion_limit": self._recursion_limit}
         try:
-            if progress_callback:
-                await progress_callback("Creating fresh LLM client", time.time() - start_time)
+            report("Creating fresh LLM client")
             
             # Create fresh LLM client for this request
             llm_client = await self._create_per_request_llm_client()
@@ -288,16 +515,14 @@ class AgentFacade:
                 )
                 return AgentResponse(success=False, message=error_message, history=[('human', message)])
             
-            if progress_callback:
-                await progress_callback("Creating MCP client for this request", time.time() - start_time)
+            report("Creating MCP client for this request")
             
-            mcp_manager, tools = await self._create_per_request_mcp_client()
+            _, tools = await self._create_per_request_mcp_client()
             
-            if progress_callback:
-                await progress_callback("Creating agent with tools", time.time() - start_time)
+            report("Creating agent with tools")
             
             # Create per-request agent with fresh LLM client and tools
-            agent, system_prompt = await self._create_per_request_agent(llm_client, tools)
+            agent = await self._create_per_request_agent(llm_client, tools)
             
             if agent is None:
                 logger.error("AgentFacade: Per-request agent could not be created.")
@@ -306,103 +531,102 @@ class AgentFacade:
                 )
                 return AgentResponse(success=False, message=error_message, history=[('human', message)])
         
-            # Configure agent execution
-            config = {"configurable": {"thread_id": user_id}}
-            
-            if progress_callback:
-                await progress_callback("Preparing agent messages", time.time() - start_time)
+            report("Preparing agent messages")
             
             # Create messages with system prompt included
-            messages = []
-            if system_prompt:
-                messages.append(SystemMessage(content=system_prompt))
-            messages.append(HumanMessage(content=message))
+            messages = [_SYSTEM_MESSAGE, HumanMessage(content=message)]
             
-            if progress_callback:
-                await progress_callback("Starting agent execution", time.time() - start_time)
+            report("Starting agent execution")
             
-            # Run the agent with configurable timeout for GitHub operations
-            agent_timeout = self.config_manager.get("timeouts", {}).get("llm_request", 300.0)
-            result = await asyncio.wait_for(
-                agent.ainvoke(
-                    {"messages": messages},
-                    config=config
-                ),
-                timeout=float(agent_timeout)  # Use configurable timeout (default 5 minutes)
-            )
+            # Run the agent with configurable timeout for GitHub operations.
+            turn_messages = list(messages)
+            async with asyncio.timeout(self._llm_request_timeout):  # Use configurable timeout (default 5 minutes)
+                async for update in agent.astream({"messages": messages}, config=config, stream_mode="updates"):
+                    for node_update in update.values():
+                        if isinstance(node_update, dict):
+                            turn_messages.extend(node_update.get("messages", ()))
             
-            if progress_callback:
-                await progress_callback("Agent execution completed", time.time() - start_time)
+            report("Agent execution completed")
             
-            # Extract response from agent result
-            if "messages" in result and isinstance(result["messages"], list):
-                messages = result["messages"]
-                
-                # Find the last AI message
-                final_response = "I processed your request but couldn't generate a response."
-                for msg in reversed(messages):
-                    # Check both for actual AIMessage instances and mock messages with type="ai"
-                    is_ai_message = (isinstance(msg, AIMessage) or 
-                                   (hasattr(msg, 'type') and getattr(msg, 'type') == 'ai'))
-                    if is_ai_message and getattr(msg, 'content', None):
-                        final_response = str(msg.content)
-                        break
-                
-                # Convert messages to history format
-                history = []
-                for msg in messages:
-                    role = getattr(msg, 'type', 'unknown')
-                    content = str(getattr(msg, 'content', ''))
-                    if isinstance(msg, AIMessage) and hasattr(msg, 'tool_calls') and msg.tool_calls:
-                        content += f" [Used {len(msg.tool_calls)} tool(s)]"
-                    history.append((role, content))
-                
-                return AgentResponse(
-                    success=True,
-                    message=final_response,
-                    history=history
-                )
-            else:
-                logger.warning("AgentFacade: Agent returned unexpected result format")
-                error_message = await self._generate_error_response(
-                    "Agent returned unexpected result format", message
-                )
-                return AgentResponse(success=False, message=error_message, history=[('human', message)])
+            final_response, history = self._extract_reply_and_history(turn_messages)
+            return AgentResponse(
+                success=True,
+                message=final_response,
+                history=history
+            )
                 
-        except asyncio.TimeoutError:
+        except asyncio.TimeoutError as e:
             logger.error(f"AgentFacade: Agent execution timed out for user {user_id}")
+            await self._handle_run_failure(agent, config, e)
             # Use hardcoded timeout message to avoid potential issues with _generate_error_response
-            timeout_message = "Request timed out. Please try again later or rephrase your question."
-            return AgentResponse(success=False, message=timeout_message, history=[('human', message), ('assistant', timeout_message)])
+            return AgentResponse(success=False, message=_TIMEOUT_MESSAGE, history=[('human', message), ('assistant', _TIMEOUT_MESSAGE)])
+            
+        except GraphRecursionError:
+            logger.warning(f"AgentFacade: Agent hit the recursion limit of {self._recursion_limit} for user {user_id}")
+            await self._close_dangling_tool_calls(agent, config)
+            return AgentResponse(success=False, message=_STEP_LIMIT_MESSAGE, history=[('human', message), ('assistant', _STEP_LIMIT_MESSAGE)])
+            
+        except asyncio.CancelledError as e:
+            logger.warning(f"AgentFacade: Agent execution cancelled for user {user_id}")
+            await self._handle_run_failure(agent, config, e)
+            raise
             
         except Exception as e:
             logger.error(f"AgentFacade: Error during agent execution: {e}", exc_info=True)
+            await self._handle_run_failure(agent, config, e)
             error_message = await self._generate_error_response(
                 f"Agent execution error: {str(e)}", message
             )
             return AgentResponse(success=False, message=error_message, history=[('human', message)])
         
         finally:
-            # Always clean up the per-request clients
-            if mcp_manager:
-                if progress_callback:
-                    await progress_callback("Cleaning up MCP client", time.time() - start_time)
-                await self._cleanup_per_request_mcp(mcp_manager)
-            
             # LLM client cleanup is automatic through garbage collection
-            if progress_callback:
-                await progress_callback("Request completed", time.time() - start_time)
+            report("Request completed")
+
+    async def stream(self, user_id: str, message: str):
+        """Yield assistant text chunks from the ReAct agent as the LLM generates them."""
+        logger.info(f"AgentFacade: Streaming GitHub query for user {user_id}")
+        await self._initialize_basic_setup_if_needed()
+        
+        llm_client = await self._create_per_request_llm_client()
+        if llm_client is None:
+            yield await self._generate_error_response("LLM client could not be created for this request", message)
+            return
+        
+        _, tools = await self._create_per_request_mcp_client()
+        agent = await self._create_per_request_agent(llm_client, tools)
+        if agent is None:
+            yield await self._generate_error_response("Agent could not be created for this request", message)
+            return
+        
+        messages = [_SYSTEM_MESSAGE, HumanMessage(content=message)]
+        config = {"configurable": {"thread_id": user_id}, "recursion_limit": self._recursion_limit}
+        try:
+            async with asyncio.timeout(self._llm_request_timeout):
+                async for chunk, metadata in agent.astream({"messages": messages}, config=config, stream_mode="messages"):
+                    if isinstance(chunk, AIMessageChunk) and chunk.content and metadata.get("langgraph_node") == "agent":
+                        yield chunk.content
+        except asyncio.TimeoutError as e:
+            logger.error(f"AgentFacade: Agent stream timed out for user {user_id}")
+            await self._handle_run_failure(agent, config, e)
+            yield _TIMEOUT_MESSAGE
+        except GraphRecursionError:
+            logger.warning(f"AgentFacade: Agent hit the recursion limit of {self._recursion_limit} for user {user_id}")
+            await self._close_dangling_tool_calls(agent, config)
+            yield _STEP_LIMIT_MESSAGE
+        except (Exception, asyncio.CancelledError) as e:
+            await self._handle_run_failure(agent, config, e)
+            raise
 
     async def _generate_error_response(self, error_context: str, user_message: str) -> str:
-        """Generate a helpful error response using a fresh LLM client."""
+        """Return a static reply for known errors; otherwise phrase one with the pooled small LLM client."""
+        template = error_template_for(error_context)
+        if template is not None:
+            return template
         try:
-            # Create a fresh LLM client for error response to avoid using potentially corrupted instance
-            fresh_llm_client = await self._create_per_request_llm_client()
-            if fresh_llm_client is None:
-                # Fallback to hardcoded message if LLM client creation fails
-                if "timeout" in error_context.lower():
-                    return "Request timed out. Please try again later or rephrase your question."
-                return "I encountered a technical issue. Please try rephrasing your question or try again later."
+            llm_client = await self._create_per_request_llm_client(small=True)
+            if llm_client is None:
+                return _GENERIC_ERROR_MESSAGE
             
             system_msg = SystemMessage(content=(
                 "You are a helpful assistant explaining issues to users. "
@@ -412,31 +636,38 @@ class AgentFacade:
             
             human_msg = HumanMessage(content=f"Context: {error_context}. User asked: '{user_message}'. Explain what happened and suggest next steps.")
             
-            response = await asyncio.wait_for(
-                fresh_llm_client.llm.ainvoke([system_msg, human_msg]),
-                timeout=10.0
-            )
+            async with asyncio.timeout(10.0):
+                response = await llm_client.llm.ainvoke([system_msg, human_msg])
             
             return response.content.strip()
             
         except Exception as e:
             logger.warning(f"Failed to generate error response: {e}")
-            if "timeout" in error_context.lower():
-                return "Request timed out. Please try again later or rephrase your question."
-            return "I encountered a technical issue. Please try rephrasing your question or try again later."
+            return _GENERIC_ERROR_MESSAGE
 
     async def close_resources(self):
         """Clean up resources."""
         logger.info("AgentFacade: Closing resources...")
         
-        # Clear references (all clients are now per-request)
+        await self._evict_mcp_client()
+        self._mcp_pool.clear()
+        self._agent_cache.clear()
+        self._tool_results.clear()
+        for llm_client in self._llm_pool.pop(asyncio.get_running_loop(), {}).values():
+            await llm_client.aclose()
+        self._llm_pool.clear()
         self._github_token = None
+        self._initialized = False
         
         logger.info("AgentFacade: Resources closed.")
 
     async def start(self):
-        """Initialize basic setup."""
+        """Initialize basic setup and start the pooled LLM and MCP clients for the running event loop."""
         await self._initialize_basic_setup_if_needed()
+        llm_client = await self._create_per_request_llm_client()
+        if llm_client is not None:
+            await llm_client.awarm_up()
+        await self._create_per_request_mcp_client()
 
     async def stop(self):
         """Stop the agent and clean up."""
@@ -1,13 +1,38 @@
 import logging
-from typing import List
+import weakref
+from collections import OrderedDict
+from typing import Any, List
 from langchain_core.language_models.base import BaseLanguageModel
+from langchain_core.messages import SystemMessage
 from langchain_core.tools import BaseTool
 from langgraph.prebuilt.chat_agent_executor import create_react_agent
-from langgraph.checkpoint.memory import MemorySaver
+from app.agent.checkpoint import BoundedMemorySaver
 from app.config_manager import ConfigManager
 
 logger = logging.getLogger(__name__)
 
+_AGENT_CACHE: OrderedDict[tuple[int, int, tuple[int, ...]], tuple[Any, Any, tuple, object]] = OrderedDict()
+_AGENT_CACHE_SIZE = 8
+_CHECKPOINTERS: weakref.WeakKeyDictionary[ConfigManager, BoundedMemorySaver] = weakref.WeakKeyDictionary()
+
+# System prompt for GitHub assistant
+_SYSTEM_PROMPT = (
+    "You are a helpful GitHub assistant. You can help users explore GitHub repositories, "
+    "analyze code, check recent changes, and answer questions about repository content. "
+    "Use the available GitHub tools to fetch information when needed. "
+    "When you have enough information to answer the user's question, provide a clear and helpful response."
+)
+_SYSTEM_MESSAGE = SystemMessage(content=_SYSTEM_PROMPT)
+
+
+def _checkpointer_for(config_manager: ConfigManager) -> BoundedMemorySaver:
+    """Return the checkpointer shared by all agents built with this config manager."""
+    checkpointer = _CHECKPOINTERS.get(config_manager)
+    if checkpointer is None:
+        checkpointer = BoundedMemorySaver(**(config_manager.get("checkpointer", {}) or {}))
+        _CHECKPOINTERS[config_manager] = checkpointer
+    return checkpointer
+
 
 def build_github_react_agent(
     config_manager: ConfigManager,
@@ -17,47 +42,32 @@ def build_github_react_agent(
     """
     Build a simple ReAct agent for GitHub interactions.
     This replaces the complex graph routing with a straightforward ReAct agent.
+    The graph is static, so it is compiled once per config, LLM and tool set and reused afterwards.
     """
-    logger.info(f"Building GitHub ReAct agent with {len(tools)} tools")
+    key = (id(config_manager), id(llm), tuple(id(tool) for tool in tools))
+    cached = _AGENT_CACHE.get(key)
+    if cached is not None:
+        _AGENT_CACHE.move_to_end(key)
+        return cached[-1]
     
-    # System prompt for GitHub assistant
-    system_prompt = (
-        "You are a helpful GitHub assistant. You can help users explore GitHub repositories, "
-        "analyze code, check recent changes, and answer questions about repository content. "
-        "Use the available GitHub tools to fetch information when needed. "
-        "When you have enough information to answer the user's question, provide a clear and helpful response."
-    )
+    logger.info(f"Building GitHub ReAct agent with {len(tools)} tools")
     
     try:
         agent = create_react_agent(
             model=llm,
             tools=tools,
-            checkpointer=MemorySaver(),
-            state_modifier=system_prompt
+            checkpointer=_checkpointer_for(config_manager),
+            prompt=_SYSTEM_MESSAGE
         )
         logger.info("GitHub ReAct agent built successfully")
+        _AGENT_CACHE[key] = (config_manager, llm, tuple(tools), agent)
+        if len(_AGENT_CACHE) > _AGENT_CACHE_SIZE:
+            _AGENT_CACHE.popitem(last=False)
         return agent
     except Exception as e:
         logger.error(f"Error building GitHub ReAct agent: {e}", exc_info=True)
         raise
 
 
-def build_langgraph_with_config(
-    config_manager: ConfigManager,
-    llm: BaseLanguageModel,
-    tools: List[BaseTool]
-) -> object:
-    """Backward compatibility wrapper for the simplified agent."""
-    return build_github_react_agent(config_manager, llm, tools)
-
-
-def get_graph(
-    config_manager: ConfigManager,
-    llm: BaseLanguageModel,
-    tools: List[BaseTool]
-) -> object:
-    """
-    Get the graph/agent for the conversation.
-    This is the main entry point used by the facade.
-    """
-    return build_github_react_agent(config_manager, llm, tools)
+build_langgraph_with_config = build_github_react_agent
+get_graph = build_github_react_agent
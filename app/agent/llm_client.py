@@ -10,9 +10,11 @@ logger = logging.getLogger(__name__)
 class LLMClient:
     """
     Manages the instantiation of the Language Model.
+    With ``small=True`` the cheaper ``llm_small_model`` is used for short side tasks.
     """
-    def __init__(self, config_manager: ConfigManager):
+    def __init__(self, config_manager: ConfigManager, small: bool = False):
         self.config_manager = config_manager
+        self.small = small
         self._llm: BaseLanguageModel | None = None
         self._initialize_llm()
 
@@ -37,6 +39,9 @@ class LLMClient:
             if test_model_env:
                 effective_model_name = test_model_env
                 logger.info(f"LLMClient: Using LLM model from TEST_LLM_MODEL env var: {effective_model_name}")
+            elif self.small:
+                effective_model_name = self.config_manager.get("llm_small_model") or self.config_manager.get("llm_model", "llama3")
+                logger.info(f"LLMClient: Using small LLM model from config ('llm_small_model'): {effective_model_name}")
             else:
                 effective_model_name = self.config_manager.get("llm_model", "llama3") # Default if not in config
                 logger.info(f"LLMClient: Using LLM model from config ('llm_model') or default: {effective_model_name}")
@@ -60,6 +65,29 @@ class LLMClient:
             # Potentially raise an error or handle fallback if critical
             raise
 
+    async def awarm_up(self):
+        """Open the async connection pool and load the model in Ollama before the first request needs it."""
+        if not self.config_manager.get("llm_warmup", True):
+            return
+        async_client = getattr(self._llm, "_async_client", None)
+        if async_client is None:
+            return
+        try:
+            await async_client.generate(model=self._llm.model, prompt="")
+            logger.info(f"LLMClient: Model '{self._llm.model}' warmed up.")
+        except Exception as e:
+            logger.warning(f"LLMClient: Warm-up of model '{self._llm.model}' failed: {e}")
+
+    async def aclose(self):
+        """Close the async HTTP connection pool of the underlying Ollama client."""
+        async_client = getattr(self._llm, "_async_client", None)
+        http_client = getattr(async_client, "_client", None)
+        if http_client is not None:
+            try:
+                await http_client.aclose()
+            except Exception as e:
+                logger.warning(f"LLMClient: Error closing async HTTP client: {e}")
+
     @property
     def llm(self) -> BaseLanguageModel:
         """Returns the initialized LLM instance."""
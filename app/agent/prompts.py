@@ -1,32 +1,26 @@
 from datetime import datetime
+from functools import lru_cache
+
+
+SYSTEM_PROMPT_STATIC = (
+    "You are Frankie, a concise, helpful assistant.\n"
+    "Ask at most one clear question at a time. When needed, search external resources, "
+    "run Python in a sandbox, or ask for the user's name and timezone to keep their profile."
+)
 
 
 def generate_system_prompt() -> str:
-    """Return the system prompt with *current* date‑time injected at call time."""
-    current_dt = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    return f"""
-You are “Frankie,” a concise, helpful AI assistant.
-Current date/time: {current_dt}
-- Ask only one clear question at a time.
-- Internally use user_info for date/time, name, and timezone (no need to display it).
-You can:
-  1. Search external resources for information.
-  2. Execute Python code in a sandbox.
-  3. Maintain consistent personal friendship with human, asking personal questions and filling they internal profile.
-Only use these capabilities if truly needed.
-"""
-
-INTENT_PROMPT = """\
-You are an intent-classification AI.
-Given the user's message, classify it into exactly one of:
-1. "chit_chat" – greetings, casual talk
-2. "search"   – needs an external search
-3. "code"     – wants Python code executed
-4. "other"    – none of the above
-
-Return JSON exactly like:
-{ "intent": "<chit_chat|search|code|other>" }
-Do not add keys.
-"""
+    """Return the system prompt with the *current* date appended at call time.
+
+    The date is the only volatile part and goes last, so the static instructions
+    stay a byte-identical prefix that the backend can reuse from its cache.
+    """
+    return _system_prompt_for(datetime.now().strftime("%Y-%m-%d"))
+
+
+@lru_cache(maxsize=2)
+def _system_prompt_for(current_date: str) -> str:
+    """Build the system prompt once per date instead of on every turn."""
+    return f"{SYSTEM_PROMPT_STATIC}\nCurrent date: {current_date}."
 
 CUSTOM_REACT_CHAT_SYSTEM_PROMPT_PREFIX = """You are a helpful AI assistant."""
@@ -12,8 +12,10 @@ class UserProfile(TypedDict, total=False):
 
 class State(TypedDict, total=False):
     """
-    Holds the running list of messages, the user profile,
-    and any extra state keys (like remaining_steps) needed by tools.
+    Holds the running window of messages, a summary of the messages that
+    fell out of it, the user profile, and any extra state keys
+    (like remaining_steps) needed by tools.
     """
     messages: Annotated[List[BaseMessage], add_messages]
+    summary: str
     profile: UserProfile
\ No newline at end of file
@@ -0,0 +1,42 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+
+def ttl_cache(maxsize: int = 1024, ttl: float = 300.0):
+    """
+    Cache a search tool's results per normalized query for ``ttl`` seconds.
+
+    The first positional argument is treated as the query and normalized with
+    ``strip().lower()``; any other arguments are part of the key as given.
+    ``None`` results are not cached so failed lookups are retried.
+    """
+    def decorator(func):
+        entries: OrderedDict = OrderedDict()
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(query: str, *args, **kwargs):
+            key = (query.strip().lower(), args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with lock:
+                entry = entries.get(key)
+                if entry is not None and entry[0] > now:
+                    entries.move_to_end(key)
+                    return entry[1]
+
+            result = func(query, *args, **kwargs)
+            if result is None:
+                return result
+
+            with lock:
+                entries[key] = (now + ttl, result)
+                entries.move_to_end(key)
+                while len(entries) > maxsize:
+                    entries.popitem(last=False)
+            return result
+
+        wrapper.cache_clear = entries.clear
+        return wrapper
+    return decorator
@@ -1,14 +1,82 @@
-import io
+import atexit
+import os
+import subprocess
 import sys
-import ast
-import traceback
+import threading
+from multiprocessing.connection import Connection
+
+from app.agent.tools.execution import sandbox
+from app.agent.tools.execution.sandbox import compile_snippet
+
+SANDBOX_KILL_GRACE_SECONDS = 2
+SANDBOX_TASKS_PER_WORKER = 100
+
+
+class _SandboxWorker:
+    """A sandbox worker process started from the ``sandbox`` entry module, and the pipes to reach it."""
+
+    def __init__(self):
+        request_read, request_write = os.pipe()
+        result_read, result_write = os.pipe()
+        try:
+            self.process = subprocess.Popen(
+                [sys.executable, "-P", sandbox.__file__, str(request_read), str(result_write)],
+                pass_fds=(request_read, result_write),
+            )
+        except BaseException:
+            os.close(request_write)
+            os.close(result_read)
+            raise
+        finally:
+            os.close(request_read)
+            os.close(result_write)
+        self.requests = Connection(request_write, readable=False)
+        self.results = Connection(result_read, writable=False)
+        self.tasks = 0
+
+    def run(self, code: str, timeout: float, wait: float) -> str | None:
+        """Run a snippet and return its output, or None if the worker does not answer within ``wait`` seconds."""
+        self.tasks += 1
+        self.requests.send((code, timeout))
+        if not self.results.poll(wait):
+            return None
+        return self.results.recv()
+
+    def stop(self):
+        """Kill the worker and wait for it to exit."""
+        self.requests.close()
+        self.results.close()
+        self.process.kill()
+        self.process.wait()
 
 
 class PythonCodeExecutor:
+    """
+    Runs snippets in a long-lived worker process instead of the server process.
+
+    The worker keeps preloaded modules warm across calls and stops a snippet that runs out of time
+    itself; it is killed and replaced when it stops answering, crashes or has run
+    SANDBOX_TASKS_PER_WORKER snippets.
+    """
+
+    def __init__(self, timeout: float = 30.0):
+        self.timeout = timeout
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+    def _stop_worker(self):
+        if self._worker is not None:
+            self._worker.stop()
+            self._worker = None
+
+    def close(self):
+        """Stop the sandbox worker."""
+        with self._worker_lock:
+            self._stop_worker()
 
     def lint_code(self, code):
         """
-        Performs a linting check on the provided Python code using the AST module.
+        Performs a linting check on the provided Python code by compiling it.
 
         Parameters:
             code (str): The Python code to be linted.
@@ -17,14 +85,14 @@ class PythonCodeExecutor:
             None if the code is syntactically correct, otherwise returns the syntax error message.
         """
         try:
-            ast.parse(code)
+            compile_snippet(code)
         except SyntaxError as e:
             return f"Syntax Error: {e.msg} (line {e.lineno}, offset {e.offset})"
         return None
 
     def execute(self, code):
         """
-        Executes a Python code snippet in a clean environment after lint verification.
+        Executes a Python code snippet in a clean namespace of the sandbox worker after lint verification.
 
         Parameters:
             code (str): The Python code to execute.
@@ -36,18 +104,20 @@ class PythonCodeExecutor:
         if lint_error:
             return lint_error
 
-        old_stdout = sys.stdout
-        redirected_output = io.StringIO()
-        sys.stdout = redirected_output
-        try:
-            # Execute code in an isolated namespace (empty dict)
-            exec(code, {})
-            output = redirected_output.getvalue()
-        except Exception:
-            output = "Error executing code:\n" + traceback.format_exc()
-        finally:
-            sys.stdout = old_stdout
-        return output
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = _SandboxWorker()
+            try:
+                output = self._worker.run(code, self.timeout, self.timeout + SANDBOX_KILL_GRACE_SECONDS)
+            except (EOFError, OSError):
+                self._stop_worker()
+                return "Error executing code:\nThe sandbox process exited unexpectedly"
+            if output is None:
+                self._stop_worker()
+                return f"Error executing code:\nExecution timed out after {self.timeout}s"
+            if self._worker.tasks >= SANDBOX_TASKS_PER_WORKER:
+                self._stop_worker()
+            return output
 
     def format_results(self, code, execution_result):
         """
@@ -67,6 +137,7 @@ class PythonCodeExecutor:
 
 
 pythonExecutor = PythonCodeExecutor()
+atexit.register(pythonExecutor.close)
 
 
 def executePython(code):
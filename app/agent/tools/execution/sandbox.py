@@ -0,0 +1,121 @@
+"""
+Entry point of the Python sandbox worker process.
+
+The worker is started as a plain script by ``PythonCodeExecutor`` so it loads only the standard
+library and ``SANDBOX_PRELOAD``, never the server's own modules.
+"""
+import contextlib
+import functools
+import importlib
+import io
+import os
+import signal
+import sys
+import traceback
+from multiprocessing.connection import Connection
+from types import CodeType
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+SANDBOX_PRELOAD = ("math", "json", "re", "datetime", "collections", "numpy", "pandas")
+SANDBOX_MEMORY_BYTES = 2 * 1024 ** 3
+SANDBOX_THREAD_ENV = ("OPENBLAS_NUM_THREADS", "OMP_NUM_THREADS", "MKL_NUM_THREADS")
+SANDBOX_MAX_OUTPUT_CHARS = 64 * 1024
+
+
+class _BoundedOutput(io.StringIO):
+    """StringIO that keeps only the first ``limit`` characters written to it."""
+
+    def __init__(self, limit):
+        super().__init__()
+        self.limit = limit
+        self.truncated = False
+
+    def write(self, s):
+        room = self.limit - self.tell()
+        if len(s) > room:
+            self.truncated = True
+            s = s[:max(room, 0)]
+        return super().write(s)
+
+
+class _SnippetTimeout(BaseException):
+    """Raised inside the worker when a snippet runs out of time."""
+
+
+@contextlib.contextmanager
+def _time_limit(seconds):
+    """Interrupt the snippet with ``_SnippetTimeout`` after ``seconds`` of wall time."""
+    if not seconds or not hasattr(signal, "setitimer"):
+        yield
+        return
+
+    def on_timeout(signum, frame):
+        raise _SnippetTimeout()
+
+    previous_handler = signal.signal(signal.SIGALRM, on_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+@functools.lru_cache(maxsize=256)
+def compile_snippet(code: str) -> CodeType:
+    """Compile a snippet once; lint and execution share the code object and repeated snippets skip compilation."""
+    return compile(code, "<sandbox>", "exec")
+
+
+def init_sandbox(preload=SANDBOX_PRELOAD, memory_bytes=SANDBOX_MEMORY_BYTES):
+    """Warm the common imports, then cap the worker's memory."""
+    for name in SANDBOX_THREAD_ENV:
+        os.environ[name] = "1"
+    for module in preload:
+        try:
+            importlib.import_module(module)
+        except Exception:
+            pass
+    if resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+
+def run_snippet(code, timeout=None):
+    """Execute a snippet and return its captured output."""
+    redirected_output = _BoundedOutput(SANDBOX_MAX_OUTPUT_CHARS)
+    try:
+        with _time_limit(timeout), contextlib.redirect_stdout(redirected_output):
+            # Execute code in an isolated namespace (empty dict)
+            exec(compile_snippet(code), {})
+        output = redirected_output.getvalue()
+        if redirected_output.truncated:
+            output += f"\n[output truncated after {SANDBOX_MAX_OUTPUT_CHARS} characters]"
+    except _SnippetTimeout:
+        output = f"Error executing code:\nExecution timed out after {timeout}s"
+    except Exception:
+        output = "Error executing code:\n" + traceback.format_exc()
+    return output
+
+
+def serve(requests: Connection, results: Connection):
+    """Answer ``(code, timeout)`` requests with the snippet output until the request pipe closes."""
+    while True:
+        try:
+            code, timeout = requests.recv()
+        except EOFError:
+            return
+        results.send(run_snippet(code, timeout))
+
+
+def main(argv: list[str]):
+    request_fd, result_fd = (int(fd) for fd in argv)
+    init_sandbox()
+    serve(Connection(request_fd, writable=False), Connection(result_fd, readable=False))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
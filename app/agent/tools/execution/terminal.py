@@ -1,21 +1,24 @@
+import os
 import subprocess
 import shlex
-from typing import List, Tuple
+from typing import Tuple
+
+from app.agent.tools.executor import offload
 
 # Define allowed and denied commands for security.
 # These lists should be populated based on specific security requirements.
 # For example, allow common informational commands but deny destructive ones.
-COMMAND_ALLOW_LIST: List[str] = [
+COMMAND_ALLOW_LIST: Tuple[str, ...] = (
     "ls",
     "pwd",
     "git status", # Example: allow specific git commands
-    "echo"
-]
-COMMAND_DENY_LIST: List[str] = [
+    "echo",
+)
+COMMAND_DENY_LIST: Tuple[str, ...] = (
     "rm",
     "sudo",
     # "git push", # Example: deny potentially risky git commands
-]
+)
 
 def is_command_allowed(command: str) -> bool:
     """
@@ -24,15 +27,23 @@ def is_command_allowed(command: str) -> bool:
     not in COMMAND_DENY_LIST.
     More specific deny rules take precedence over allow rules.
     """
-    # Check against deny list first
-    for denied_cmd in COMMAND_DENY_LIST:
-        if command.startswith(denied_cmd):
-            return False
-    # Check against allow list
-    for allowed_cmd in COMMAND_ALLOW_LIST:
-        if command.startswith(allowed_cmd):
-            return True
-    return False # Default to deny if not explicitly allowed
+    # Check against deny list first, then the allow list; default to deny if not explicitly allowed
+    return not command.startswith(COMMAND_DENY_LIST) and command.startswith(COMMAND_ALLOW_LIST)
+
+def _echo(args: list) -> Tuple[str, str, int] | None:
+    if args and args[0].startswith("-"):
+        return None
+    return " ".join(args) + "\n", "", 0
+
+def _pwd(args: list) -> Tuple[str, str, int] | None:
+    if args:
+        return None
+    return os.getcwd() + "\n", "", 0
+
+BUILTIN_COMMANDS = {
+    "echo": _echo,
+    "pwd": _pwd,
+}
 
 def execute_terminal_command(command: str) -> Tuple[str, str, int]:
     """
@@ -55,6 +66,10 @@ def execute_terminal_command(command: str) -> Tuple[str, str, int]:
     try:
         # shlex.split is used to handle quoted arguments correctly
         args = shlex.split(command)
+        builtin = BUILTIN_COMMANDS.get(args[0])
+        result = builtin(args[1:]) if builtin else None
+        if result is not None:
+            return result
         process = subprocess.run(
             args,
             capture_output=True,
@@ -86,6 +101,7 @@ execute_terminal_command.args_schema = {
     },
     "required": ["command"]
 }
+execute_terminal_command.coroutine = offload(execute_terminal_command)
 
 if __name__ == '__main__':
     # Example usage:
@@ -0,0 +1,24 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+TOOL_POOL_WORKERS = 32
+
+TOOL_POOL = ThreadPoolExecutor(max_workers=TOOL_POOL_WORKERS, thread_name_prefix="aquarius-tool")
+
+
+def offload(func):
+    """
+    Return an async variant of a blocking tool function that runs it on TOOL_POOL.
+
+    Parameters:
+        func (callable): The synchronous tool function.
+
+    Returns:
+        callable: A coroutine function with the same signature and metadata.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(TOOL_POOL, functools.partial(func, *args, **kwargs))
+    return wrapper
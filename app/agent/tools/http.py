@@ -0,0 +1,41 @@
+import atexit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+from app.agent.tools.executor import TOOL_POOL_WORKERS
+
+POOL_MAXSIZE = TOOL_POOL_WORKERS
+RETRY = Retry(
+    total=3,
+    status_forcelist=(429, 502, 503, 504),
+    allowed_methods=frozenset(["GET"]),
+    backoff_factor=0.5,
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+
+def create_session(headers: dict | None = None) -> requests.Session:
+    """
+    Create a keep-alive HTTP session shared by all calls of a search tool.
+
+    Reusing one session per external host skips the TCP and TLS handshake on warm calls.
+    GET requests are retried on 429 and 5xx gateway errors, honouring Retry-After.
+    The session is closed at interpreter exit.
+
+    Parameters:
+        headers (dict | None): Default headers sent with every request.
+
+    Returns:
+        requests.Session: A session with a connection pool sized for the tool pool.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE, max_retries=RETRY)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    atexit.register(session.close)
+    return session
@@ -1,6 +1,13 @@
 import re
-import requests
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from bs4 import BeautifulSoup, SoupStrainer
+
+from app.agent.tools.cache import ttl_cache
+from app.agent.tools.http import create_session
+from app.agent.tools.executor import offload
+
+_AUTHORS_PREFIX = re.compile(r'^Authors:\s*')
+_WHITESPACE = re.compile(r'\s+')
 
 
 def format_results_as_markdown(results: list) -> str:
@@ -13,13 +20,15 @@ def format_results_as_markdown(results: list) -> str:
     Returns:
         str: A Markdown-formatted string representation of the search results.
     """
-    md = "# arXiv Search Results\n\n"
+    parts = ["# arXiv Search Results\n\n"]
     for i, paper in enumerate(results, 1):
-        md += f"## {i}. {paper['title']}\n"
-        md += f"**Authors:** {paper['authors']}\n\n"
-        md += f"**Abstract:** {paper['abstract']}\n\n"
-        md += f"**Link:** [View Paper]({paper['link']})\n\n"
-    return md
+        parts.append(
+            f"## {i}. {paper['title']}\n"
+            f"**Authors:** {paper['authors']}\n\n"
+            f"**Abstract:** {paper['abstract']}\n\n"
+            f"**Link:** [View Paper]({paper['link']})\n\n"
+        )
+    return "".join(parts)
 
 
 class ArxivSearch:
@@ -28,70 +37,92 @@ class ArxivSearch:
     """
     base_url = "https://arxiv.org/search/"
     valid_sizes = [25, 50, 100, 200]
+    page_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="aquarius-arxiv")
+    result_strainer = SoupStrainer("li", class_="arxiv-result")
+    session = create_session()
+
+    @staticmethod
+    @ttl_cache()
+    def fetch_page(query: str, size: int, start: int) -> list | None:
+        """
+        Fetch and parse one page of arXiv search results.
+
+        Failed and empty pages return None, so the cache retries them instead of keeping them.
+
+        Parameters:
+            query (str): The search query.
+            size (int): The page size, one of valid_sizes.
+            start (int): Offset of the first result on the page.
+
+        Returns:
+            list | None: A list of dictionaries containing paper details, or None on error or no results.
+        """
+        params = {
+            "searchtype": "all",
+            "query": query,
+            "abstracts": "show",
+            "order": "",
+            "size": str(size),
+            "start": str(start)
+        }
+        results = []
+        try:
+            response = ArxivSearch.session.get(ArxivSearch.base_url, params=params, timeout=10)
+            response.raise_for_status()
+            soup = BeautifulSoup(response.content, 'html.parser', parse_only=ArxivSearch.result_strainer)
+            for paper in soup.find_all("li", class_="arxiv-result", recursive=False):
+                title = paper.find("p", class_="title").text.strip()
+                authors = paper.find("p", class_="authors").text.strip()
+                authors = _WHITESPACE.sub(' ', _AUTHORS_PREFIX.sub('', authors)).strip()
+
+                abstract = paper.find("span", class_="abstract-full").text.strip()
+                abstract = abstract.replace("△ Less", "").strip()
+
+                link = paper.find("p", class_="list-title").find("a")["href"]
+
+                results.append({
+                    "title": title,
+                    "authors": authors,
+                    "abstract": abstract,
+                    "link": link
+                })
+        except Exception as e:
+            print(f"Error during arXiv search: {e}")
+            return None
+        return results or None
 
     @staticmethod
-    def search(query: str) -> list:
+    def search(query: str, max_results: int = 25) -> list:
         """
         Search for scientific papers on arXiv matching the query.
 
+        The smallest page size that covers max_results is used, so up to 200 results take a
+        single request; larger requests fetch their pages concurrently.
+
         Parameters:
             query (str): The search query.
+            max_results (int): The maximum number of papers to return.
 
         Returns:
             list: A list of dictionaries containing paper details.
         """
-        size = 25
-        # Validate and adjust the size if necessary.
-        if size not in ArxivSearch.valid_sizes:
-            size = min(ArxivSearch.valid_sizes, key=lambda x: abs(x - size))
+        max_results = max(1, max_results)
+        size = next((s for s in ArxivSearch.valid_sizes if s >= max_results), ArxivSearch.valid_sizes[-1])
+        offsets = range(0, max_results, size)
+
+        if len(offsets) == 1:
+            pages = [ArxivSearch.fetch_page(query, size, 0)]
+        else:
+            pages = ArxivSearch.page_pool.map(lambda start: ArxivSearch.fetch_page(query, size, start), offsets)
+
         results = []
-        start = 0
-        max_results = min(25, 100)
-
-        while len(results) < max_results:
-            params = {
-                "searchtype": "all",
-                "query": query,
-                "abstracts": "show",
-                "order": "",
-                "size": str(size),
-                "start": str(start)
-            }
-            try:
-                response = requests.get(ArxivSearch.base_url, params=params)
-                soup = BeautifulSoup(response.content, 'html.parser')
-                papers = soup.find_all("li", class_="arxiv-result")
-                if not papers:
-                    break
-
-                for paper in papers:
-                    if len(results) >= max_results:
-                        break
-
-                    title = paper.find("p", class_="title").text.strip()
-                    authors = paper.find("p", class_="authors").text.strip()
-                    authors = re.sub(r'^Authors:\s*', '', authors)
-                    authors = re.sub(r'\s+', ' ', authors).strip()
-
-                    abstract = paper.find("span", class_="abstract-full").text.strip()
-                    abstract = abstract.replace("△ Less", "").strip()
-
-                    link = paper.find("p", class_="list-title").find("a")["href"]
-
-                    results.append({
-                        "title": title,
-                        "authors": authors,
-                        "abstract": abstract,
-                        "link": link
-                    })
-
-                start += size
-
-            except Exception as e:
-                print(f"Error during arXiv search: {e}")
-                break
-
-        return results
+        seen_links = set()
+        for page in pages:
+            for paper in page or []:
+                if paper["link"] not in seen_links:
+                    seen_links.add(paper["link"])
+                    results.append(paper)
+        return results[:max_results]
 
 
 # Expose a tool named 'search_arxiv' for the LangGraph agent
@@ -100,7 +131,7 @@ def search_arxiv(query: str, max_results: int = 5) -> str:
     """
     Search arXiv for papers matching the query and return Markdown-formatted results.
     """
-    results = ArxivSearch.search(query)
+    results = ArxivSearch.search(query, max_results)
     return format_results_as_markdown(results)
 
 # Attach a name attribute for tool discovery
@@ -114,3 +145,4 @@ search_arxiv.args_schema = {
     },
     "required": ["query"]
 }
+search_arxiv.coroutine = offload(search_arxiv)
@@ -1,6 +1,9 @@
 import requests
 from pydantic import BaseModel
 
+from app.agent.tools.cache import ttl_cache
+from app.agent.tools.executor import offload
+from app.agent.tools.http import create_session
 from app.config_manager import configManager
 from app.server.web_driver import webDriverService
 
@@ -11,6 +14,7 @@ class GoogleSearch:
         self.cse_id = configManager.get("google_cx")
         self.service_url = "https://www.googleapis.com/customsearch/v1"
         self.webDriver = webDriver;
+        self.session = create_session()
 
     def search(self, query):
         """
@@ -22,7 +26,7 @@ class GoogleSearch:
             "q": query
         }
         try:
-            response = requests.get(self.service_url, params=params)
+            response = self.session.get(self.service_url, params=params, timeout=10)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.HTTPError as http_err:
@@ -81,8 +85,12 @@ googleSearcherService = GoogleSearch(configManager=configManager, webDriver=webD
 
 
 
+@ttl_cache()
 def googleSearcher(query: str) -> str:
     """
     Using structured input with a 'query' field.
     """
     return googleSearcherService.search(query)
+
+
+googleSearcher.coroutine = offload(googleSearcher)
@@ -2,6 +2,8 @@ import praw
 import datetime
 import os
 
+from app.agent.tools.cache import ttl_cache
+from app.agent.tools.executor import offload
 from app.config_manager import configManager
 
 
@@ -15,17 +17,19 @@ def format_results_as_markdown(results: list) -> str:
     Returns:
         str: A markdown formatted string representation of the search results.
     """
-    md = "# Reddit Search Results\n\n"
+    parts = ["# Reddit Search Results\n\n"]
     for post in results:
-        created_str = datetime.datetime.utcfromtimestamp(
-            post['created_utc']
-        ).strftime('%Y-%m-%d %H:%M:%S UTC')
-        md += f"## {post['title']}\n"
-        md += f"- **Subreddit:** {post['subreddit']}\n"
-        md += f"- **Score:** {post['score']}\n"
-        md += f"- **Created:** {created_str}\n"
-        md += f"- **URL:** [Link]({post['url']})\n\n"
-    return md
+        created_str = datetime.datetime.fromtimestamp(
+            post['created_utc'], tz=datetime.timezone.utc
+        ).isoformat(sep=' ', timespec='seconds')[:19] + " UTC"
+        parts.append(
+            f"## {post['title']}\n"
+            f"- **Subreddit:** {post['subreddit']}\n"
+            f"- **Score:** {post['score']}\n"
+            f"- **Created:** {created_str}\n"
+            f"- **URL:** [Link]({post['url']})\n\n"
+        )
+    return "".join(parts)
 
 
 class RedditSearch:
@@ -91,6 +95,7 @@ else:
     print(f"Skipping RedditSearch initialization for APP_COMPONENT='{app_component}'.")
 
 
+@ttl_cache()
 def redditSearcher(query, subreddit="all"):
     """
     Search for posts on Reddit matching the query.
@@ -98,3 +103,6 @@ def redditSearcher(query, subreddit="all"):
     if redditSearcherService:
         return redditSearcherService.search(query, subreddit)
     return "Reddit search tool is not available in this component."
+
+
+redditSearcher.coroutine = offload(redditSearcher)
@@ -1,6 +1,13 @@
 import os
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+ENV_OVERRIDE_KEYS = frozenset({"llm_base_url", "test_mode", "llm_model", "github_token"})
+
 
 class ConfigManager:
     """
@@ -17,6 +24,7 @@ class ConfigManager:
 
         self.config = self._load_config(self.config_file)
         self.keys = self._load_config(self.keys_file, optional=True)
+        self._merged = {**self.config, **self.keys}
 
     def _load_config(self, file_path, optional=False):
         if not os.path.exists(file_path):
@@ -24,10 +32,13 @@ class ConfigManager:
                 return {}  # Return empty dict if optional file is not found
             raise FileNotFoundError(f"Configuration file '{file_path}' not found.")
         with open(file_path, "r", encoding="utf-8") as f:
-            config_data = yaml.safe_load(f)
+            config_data = yaml.load(f, Loader=SafeLoader)
         return config_data if config_data is not None else {}  # Ensure {} if file is empty
 
     def get(self, key, default=None):
+        if key not in ENV_OVERRIDE_KEYS:
+            return self._merged.get(key, default)
+
         # Check for environment variables for specific keys
         if key == "llm_base_url":
             env_value = os.getenv("LLM_BASE_URL")
@@ -58,7 +69,7 @@ class ConfigManager:
                 return "qwen3:8b"
 
         # Prioritize keys file, then config file
-        value = self.keys.get(key, self.config.get(key, default))
+        value = self._merged.get(key, default)
         # Fallback to environment variable if key is github_token and not found
         if key == "github_token" and value is None:
             value = os.getenv("GITHUB_TOKEN", os.getenv("GITHUB_PERSONAL_ACCESS_TOKEN", default))
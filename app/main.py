@@ -1,36 +1,30 @@
 # main.py
 from app.server.routes import app
 from app.ui import AquariusUI
-from multiprocessing import Process
+import threading
 import sys
 import socket
 import os
+import time
+import logging
 from app.config_manager import configManager
 
 
 def start_api(port):
     import atexit
-    import asyncio
-    from app.server.chat import ChatService
+    from app.server import routes
     
-    # Create a chat service reference for cleanup
-    chat_service = None
-    for rule in app.url_map.iter_rules():
-        if hasattr(app.view_functions.get(rule.endpoint, {}), '__closure__'):
-            for cell in app.view_functions.get(rule.endpoint).__closure__ or []:
-                if hasattr(cell, 'cell_contents') and isinstance(cell.cell_contents, ChatService):
-                    chat_service = cell.cell_contents
-                    break
+    chat_service = routes.chat_service
+    if chat_service:
+        chat_service.warm_up()
     
     # Register cleanup function to ensure resources are properly released
     def cleanup_resources():
         print("Flask shutting down, cleaning up resources...")
         if chat_service:
             try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                loop.run_until_complete(chat_service.close_agent_resources())
-                loop.close()
+                chat_service.cleanup()
+                chat_service.shutdown()
                 print("Chat service resources cleaned up successfully")
             except Exception as e:
                 print(f"Error during cleanup: {e}")
@@ -49,6 +43,18 @@ def start_api(port):
         sys.exit(1)
 
 
+def wait_for_port(host, port, timeout=10.0):
+    """Poll until a TCP server accepts connections on host:port; return False if it never does within timeout."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.1):
+                return True
+        except OSError:
+            time.sleep(0.05)
+    return False
+
+
 def main():
     parser = argparse.ArgumentParser(description="Aquarius Application Launcher")
     parser.add_argument("--component", choices=["api", "ui", "all"], default=os.getenv("APP_COMPONENT", "all"),
@@ -62,6 +68,11 @@ def main():
 
     args = parser.parse_args()
 
+    logging.basicConfig(
+        level=logging.DEBUG if configManager.get("debug_mode", False) else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
     # Set environment variables for test mode
     if args.test_mode:
         os.environ["TEST_MODE"] = "true"
@@ -93,15 +104,13 @@ def main():
         ui_actual_port = ui_port
 
         print(f"ALL component selected. API target port: {api_actual_port}") # ADD THIS
-        print(f"Starting API server on port {api_actual_port} as a background process...")
-        api_proc = Process(target=start_api, args=(api_actual_port,))
-        api_proc.daemon = True
-        api_proc.start()
+        print(f"Starting API server on port {api_actual_port} as a background thread...")
+        api_thread = threading.Thread(target=start_api, args=(api_actual_port,), name="aquarius-api", daemon=True)
+        api_thread.start()
 
-        # Ensure API has a moment to start before UI tries to connect if defaults are used
-        # This is a simple delay; a more robust solution would be health checks.
         if args.api_url == f"http://127.0.0.1:{api_actual_port}/api/chat": # Basic check if UI is targeting local API
-            time.sleep(3) 
+            if not wait_for_port("127.0.0.1", api_actual_port):
+                print(f"API not accepting connections on port {api_actual_port} yet; starting UI anyway")
 
         AquariusUI.CHAT_API_URL = args.api_url # Override CHAT_API_URL for UI
         print(f"Starting UI server on port {ui_actual_port}, connecting to API at {args.api_url}...")
@@ -112,5 +121,4 @@ def main():
 
 if __name__ == "__main__":
     import argparse # Moved import here
-    import time # Moved import here
     main()
@@ -1,19 +1,33 @@
 # app/server/chat.py
 import asyncio # Added for running async AgentFacade methods
+import concurrent.futures
+import queue
+import threading
+from typing import Iterator
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
 # Removed: from app.agent.graph import get_graph
-from app.agent.facade import AgentFacade # Added
+from app.agent.facade import AgentFacade, error_template_for
+from app.config_manager import configManager
 from app.server.models import AgentResponse
 import os
+import re
 import logging
 logger = logging.getLogger(__name__)
 
+GITHUB_REQUEST_KEYWORDS = ["github", "repository", "repo", "commit", "pull request", "issue", "vscode", "microsoft", "changes"]
+GITHUB_REQUEST_PATTERN = re.compile("|".join(map(re.escape, GITHUB_REQUEST_KEYWORDS)), re.IGNORECASE)
+
 class ChatService:
     def __init__(self):
         # Initialize AgentFacade. 
         # AgentFacade will handle its own lazy initialization of graph and dependencies.
         self.agent_facade = AgentFacade() # Manages graph, LLM, tools
+        self._event_loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: threading.Thread | None = None
+        self._loop_pid: int | None = None
+        self._loop_lock = threading.Lock()
+        self._api_request_timeout = float((configManager.get("timeouts", {}) or {}).get("api_request", 300.0))
         logger.info("ChatService initialized with AgentFacade.")
         # The decision to load real tools vs. mocks should ideally be handled 
         # by the environment/configuration AgentFacade uses, not a simple env var here.
@@ -46,6 +60,46 @@ class ChatService:
             serialized.append({"role": role, "content": content})
         return serialized
 
+    def _loop(self) -> asyncio.AbstractEventLoop:
+        """Return the persistent event loop, starting its thread on first use in this process."""
+        if self._loop_pid != os.getpid():
+            with self._loop_lock:
+                if self._loop_pid != os.getpid():
+                    self._event_loop = asyncio.new_event_loop()
+                    self._loop_thread = threading.Thread(
+                        target=self._event_loop.run_forever, name="aquarius-agent-loop", daemon=True
+                    )
+                    self._loop_thread.start()
+                    self._loop_pid = os.getpid()
+        return self._event_loop
+
+    def warm_up(self):
+        """Start the agent's long-lived clients on the persistent loop without blocking the caller."""
+        future = asyncio.run_coroutine_threadsafe(self.agent_facade.start(), self._loop())
+        
+        def log_result(done):
+            if done.exception() is not None:
+                logger.warning(f"ChatService: Agent warm-up failed: {done.exception()}")
+            else:
+                logger.info("ChatService: Agent warm-up completed")
+        
+        future.add_done_callback(log_result)
+        return future
+
+    def _run(self, coro, timeout: float | None = None):
+        """Run a coroutine on the persistent event loop and block until it finishes."""
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop())
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    @staticmethod
+    def _is_github_request(message: str) -> bool:
+        """Detect GitHub-related requests with a precompiled keyword pattern."""
+        return GITHUB_REQUEST_PATTERN.search(message) is not None
+
     def process_message(self, user_id: str, message: str) -> tuple[str, list[dict[str, str]]]:
         logger.info(f"ChatService: Starting process_message for user_id: {user_id}")
         logger.info(f"ChatService: Message content: '{message[:100]}...'")
@@ -57,7 +111,7 @@ class ChatService:
             logger.error("ChatService: AgentFacade not initialized.")
             # Generate LLM-based error response instead of hardcoded
             try:
-                fallback_reply = asyncio.run(
+                fallback_reply = self._run(
                     self._generate_error_response("Chat service not properly configured", message)
                 )
             except Exception:
@@ -71,17 +125,16 @@ class ChatService:
             logger.info("ChatService: About to determine timeout settings")
             
             # Check if we're in test mode for timeout adjustment
-            from app.config_manager import configManager
             test_mode = configManager.get("test_mode", False)
             logger.info(f"ChatService: test_mode = {test_mode}")
             
             # Check if this is a GitHub-related request that needs more time
-            github_request = any(keyword in message.lower() for keyword in ["github", "repository", "repo", "commit", "pull request", "issue", "vscode", "microsoft", "changes"])
+            github_request = self._is_github_request(message)
             logger.info(f"ChatService: github_request = {github_request}")
             
             if github_request or test_mode:
                 # Use configurable timeout for GitHub requests and tests
-                timeout = configManager.get("timeouts.api_request", 300.0)
+                timeout = self._api_request_timeout
             else:
                 timeout = 60.0  # Default timeout for non-GitHub production requests
             
@@ -89,52 +142,11 @@ class ChatService:
                 # Use appropriate timeout
                 logger.info(f"ChatService: Using timeout of {timeout}s (test_mode={test_mode})")
                 
-                # Handle event loop properly for async operations
-                logger.info("ChatService: Checking for existing event loop")
-                try:
-                    # Check if there's already a running loop
-                    current_loop = asyncio.get_running_loop()
-                    logger.info("ChatService: Found running event loop - using asyncio.run in thread")
-                    
-                    # If there's already a running loop, we need to run in a separate thread
-                    import concurrent.futures
-                    import threading
-                    
-                    def run_agent_in_thread():
-                        # Create a new event loop in this thread
-                        new_loop = asyncio.new_event_loop()
-                        asyncio.set_event_loop(new_loop)
-                        try:
-                            return new_loop.run_until_complete(
-                                asyncio.wait_for(
-                                    self.agent_facade.invoke(user_id, message),
-                                    timeout=timeout
-                                )
-                            )
-                        finally:
-                            new_loop.close()
-                    
-                    # Run in a thread to avoid event loop conflicts
-                    with concurrent.futures.ThreadPoolExecutor() as executor:
-                        future = executor.submit(run_agent_in_thread)
-                        agent_response = future.result(timeout=timeout + 5)  # Extra 5s for thread overhead
-                    
-                    logger.info("ChatService: agent_facade.invoke completed successfully")
-                    
-                except RuntimeError:
-                    # No running loop, safe to create one
-                    logger.info("ChatService: No running event loop - using direct asyncio.run")
-                    
-                    def run_agent_async():
-                        return asyncio.run(
-                            asyncio.wait_for(
-                                self.agent_facade.invoke(user_id, message),
-                                timeout=timeout
-                            )
-                        )
-                    
-                    agent_response = run_agent_async()
-                    logger.info("ChatService: agent_facade.invoke completed successfully")
+                agent_response = self._run(
+                    asyncio.wait_for(self.agent_facade.invoke(user_id, message), timeout=timeout),
+                    timeout=timeout + 5  # Extra 5s for cross-thread overhead
+                )
+                logger.info("ChatService: agent_facade.invoke completed successfully")
                         
             except asyncio.TimeoutError:
                 logger.warning(f"ChatService: Agent invocation timed out after {timeout}s.")
@@ -144,6 +156,23 @@ class ChatService:
                     {"role": "assistant", "content": fallback_reply}
                 ]
                 return fallback_reply, history
+            except concurrent.futures.CancelledError:
+                logger.warning("ChatService: Agent invocation was cancelled.")
+                try:
+                    # Use the persistent event loop for error response generation
+                    if not self._event_loop.is_closed():
+                        fallback_reply = self._run(
+                            self._generate_error_response("Request was cancelled or interrupted", message)
+                        )
+                    else:
+                        fallback_reply = "My response was interrupted. Please try again."
+                except Exception:
+                    fallback_reply = "My response was interrupted. Please try again."
+                history = [
+                    {"role": "user", "content": message},
+                    {"role": "assistant", "content": fallback_reply}
+                ]
+                return fallback_reply, history
             except Exception as e:
                 logger.error(f"ChatService: Exception during agent invocation: {e}", exc_info=True)
                 fallback_reply = "I had trouble processing your request. Please try again."
@@ -157,7 +186,7 @@ class ChatService:
                 reply = agent_response.message
                 # agent_response.history is List[Tuple[str, str]]
                 history = self._serialize_messages_from_tuples(agent_response.history)
-                logger.debug(f"ChatService successfully processed message. Reply: {reply}")
+                logger.debug("ChatService successfully processed message. Reply: %s", reply)
                 return reply, history
             else:
                 logger.error(f"ChatService: AgentFacade invocation failed. Error: {agent_response.message}")
@@ -167,8 +196,8 @@ class ChatService:
                 else:
                     try:
                         # Use the persistent event loop for error response generation
-                        if hasattr(self, '_event_loop') and not self._event_loop.is_closed():
-                            fallback_reply = self._event_loop.run_until_complete(
+                        if not self._event_loop.is_closed():
+                            fallback_reply = self._run(
                                 self._generate_error_response("Agent invocation failed", message)
                             )
                         else:
@@ -180,24 +209,6 @@ class ChatService:
                 history = self._serialize_messages_from_tuples(history_tuples)
                 return fallback_reply, history
 
-        except asyncio.CancelledError:
-            logger.warning("ChatService: Agent invocation was cancelled.")
-            try:
-                # Use the persistent event loop for error response generation
-                if hasattr(self, '_event_loop') and not self._event_loop.is_closed():
-                    fallback_reply = self._event_loop.run_until_complete(
-                        self._generate_error_response("Request was cancelled or interrupted", message)
-                    )
-                else:
-                    fallback_reply = "My response was interrupted. Please try again."
-            except Exception:
-                fallback_reply = "My response was interrupted. Please try again."
-            history = [
-                {"role": "user", "content": message},
-                {"role": "assistant", "content": fallback_reply}
-            ]
-            return fallback_reply, history
-            
         except Exception as e:
             logger.error(f"ChatService: Exception during agent invocation: {e}", exc_info=True)
             
@@ -209,8 +220,8 @@ class ChatService:
                 
             try:
                 # Use the persistent event loop for error response generation
-                if hasattr(self, '_event_loop') and not self._event_loop.is_closed():
-                    fallback_reply = self._event_loop.run_until_complete(
+                if not self._event_loop.is_closed():
+                    fallback_reply = self._run(
                         self._generate_error_response(f"Unexpected error: {str(e)}", message)
                     )
                 else:
@@ -223,6 +234,37 @@ class ChatService:
             ]
             return fallback_reply, history
 
+    def stream_message(self, user_id: str, message: str) -> Iterator[str]:
+        """Yield reply chunks as the agent generates them, bridging the async stream into a sync iterator."""
+        logger.info(f"ChatService: Starting stream_message for user_id: {user_id}")
+        chunks: queue.Queue = queue.Queue()
+        done = object()
+        
+        async def pump():
+            try:
+                async for chunk in self.agent_facade.stream(user_id, message):
+                    chunks.put(chunk)
+            except Exception as e:
+                logger.error(f"ChatService: Exception during streaming agent invocation: {e}", exc_info=True)
+                chunks.put("I had trouble processing your request. Please try again.")
+            finally:
+                chunks.put(done)
+        
+        future = asyncio.run_coroutine_threadsafe(pump(), self._loop())
+        try:
+            while True:
+                try:
+                    chunk = chunks.get(timeout=self._api_request_timeout)
+                except queue.Empty:
+                    logger.warning(f"ChatService: No stream chunk within {self._api_request_timeout}s.")
+                    yield "Request timed out. Please try asking something simpler or try again later."
+                    return
+                if chunk is done:
+                    return
+                yield chunk
+        finally:
+            future.cancel()
+
     def get_history(self, user_id: str) -> list[dict[str, str]]:
         # TODO: Implement history retrieval through AgentFacade if needed.
         # AgentFacade currently doesn't expose a direct method to get checkpointed state easily.
@@ -244,12 +286,15 @@ class ChatService:
             logger.info("ChatService: AgentFacade resources stopped.")
 
     async def _generate_error_response(self, error_context: str, user_message: str) -> str:
-        """Generate an LLM-based error response instead of using hardcoded messages."""
+        """Generate an LLM-based error response, skipping the LLM for known error causes."""
+        template = error_template_for(error_context)
+        if template is not None:
+            return template
         try:
             from app.agent.llm_client import LLMClient
             
             # Use a minimal LLM client for error response generation
-            llm_client = LLMClient(config_manager=self.agent_facade.config_manager)
+            llm_client = LLMClient(config_manager=self.agent_facade.config_manager, small=True)
             
             system_prompt = (
                 "You are a helpful assistant explaining technical issues to users. "
@@ -294,49 +339,33 @@ class ChatService:
             )
 
     def cleanup(self):
-        """Clean up resources including the persistent event loop."""
+        """Clean up agent resources while keeping the persistent event loop alive."""
         logger.info("ChatService: Starting cleanup")
         
-        # Clean up agent facade first without affecting the persistent event loop
         if hasattr(self, 'agent_facade') and self.agent_facade:
             try:
-                # If we have a persistent loop, use it for cleanup, otherwise create a temporary one
-                if hasattr(self, '_event_loop') and not self._event_loop.is_closed():
-                    cleanup_loop = self._event_loop
+                if self._event_loop is None or not self._event_loop.is_closed():
+                    self._run(self.agent_facade.close_resources())
                 else:
-                    cleanup_loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(cleanup_loop)
-                
-                cleanup_loop.run_until_complete(self.agent_facade.close_resources())
-                
-                # Close temporary loop if we created one
-                if cleanup_loop != getattr(self, '_event_loop', None):
-                    cleanup_loop.close()
-                    
+                    asyncio.run(self.agent_facade.close_resources())
                 logger.info("ChatService: Agent facade cleaned up successfully")
             except Exception as e:
                 logger.warning(f"ChatService: Error during agent facade cleanup: {e}")
         
-        # Only close the persistent event loop if explicitly requested
-        # For normal operation, keep the loop alive for better performance
-        if hasattr(self, '_event_loop') and not self._event_loop.is_closed():
-            try:
-                # Don't cancel pending tasks automatically - they might be important MCP connections
-                # Only cancel them during final shutdown
-                logger.info("ChatService: Persistent event loop kept alive (use shutdown() to close)")
-            except Exception as e:
-                logger.warning(f"ChatService: Error during event loop inspection: {e}")
-        
-        logger.info("ChatService: Cleanup completed")
+        # Don't cancel pending tasks here - they might be important MCP connections.
+        # Only cancel them during final shutdown
+        logger.info("ChatService: Cleanup completed, persistent event loop kept alive (use shutdown() to close)")
     
     def shutdown(self):
-        """Final shutdown that closes the persistent event loop."""
+        """Final shutdown that stops and closes the persistent event loop."""
         logger.info("ChatService: Starting final shutdown")
         
-        # Close the persistent event loop if it exists
-        if hasattr(self, '_event_loop') and not self._event_loop.is_closed():
+        if self._loop_pid == os.getpid() and not self._event_loop.is_closed():
             try:
-                # Cancel any pending tasks
+                self._event_loop.call_soon_threadsafe(self._event_loop.stop)
+                self._loop_thread.join(timeout=5.0)
+                
+                # Cancel any pending tasks now that the loop is no longer running
                 pending_tasks = [task for task in asyncio.all_tasks(self._event_loop) if not task.done()]
                 if pending_tasks:
                     logger.warning(f"ChatService: {len(pending_tasks)} pending tasks found during shutdown")
@@ -350,4 +379,4 @@ class ChatService:
             except Exception as e:
                 logger.warning(f"ChatService: Error during event loop shutdown: {e}")
         
-        logger.info("ChatService: Final shutdown completed")
\ No newline at end of file
+        logger.info("ChatService: Final shutdown completed")
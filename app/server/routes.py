@@ -1,11 +1,11 @@
 # app/server/routes.py
 import os
+import json
 import logging
-from flask import Flask, request, jsonify, Blueprint, current_app
+from flask import Flask, Response, request, jsonify, Blueprint, current_app, stream_with_context
 
 app = Flask(__name__)
 bp = Blueprint('api', __name__)
-app.logger.setLevel(logging.DEBUG)
 
 APP_COMPONENT = os.environ.get("APP_COMPONENT")
 chat_service = None
@@ -43,22 +43,22 @@ def chat_endpoint():
                 "or there's a misconfiguration."
             )
             # Generate dynamic error response
-            import asyncio
             try:
                 # Create a temporary ChatService just for error response generation
                 from app.server.chat import ChatService
                 temp_chat_service = ChatService()
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                error_message = loop.run_until_complete(
-                    temp_chat_service._generate_error_response(
-                        "Service unavailable", 
-                        f"Component '{APP_COMPONENT}' configuration issue"
+                try:
+                    error_message = temp_chat_service._run(
+                        temp_chat_service._generate_error_response(
+                            "Service unavailable", 
+                            f"Component '{APP_COMPONENT}' configuration issue"
+                        ),
+                        timeout=10.0
                     )
-                )
-                # Clean up resources
-                loop.run_until_complete(temp_chat_service.close_agent_resources())
-                loop.close()
+                finally:
+                    # Clean up resources
+                    temp_chat_service.cleanup()
+                    temp_chat_service.shutdown()
             except Exception as gen_error:
                 app.logger.error(f"Failed to generate dynamic error response: {gen_error}")
                 # Generate timestamp-based dynamic message as last resort
@@ -88,8 +88,13 @@ def chat_endpoint():
         
         try:
             if stream:
-                # Stream not implemented yet
-                return jsonify({"error": "Streaming not implemented"}), 501
+                def event_stream():
+                    for chunk in chat_service.stream_message(user_id, user_input):
+                        yield f"data: {json.dumps({'delta': chunk})}\n\n"
+                    yield "data: [DONE]\n\n"
+                
+                logger.info(f"POST /chat - Streaming response for User ID: {user_id}")
+                return Response(stream_with_context(event_stream()), mimetype="text/event-stream")
             else:
                 logger.info(f"POST /chat - About to call chat_service.process_message")
                 assistant_reply, full_history = chat_service.process_message(user_id, user_input)
@@ -99,7 +104,7 @@ def chat_endpoint():
                     "messages": full_history
                 }
                 logger.info(f"POST /chat - Successfully processed non-streamed request for User ID: {user_id}")
-                logger.debug(f"POST /chat - API Response Data: {response_data}")
+                logger.debug("POST /chat - API Response Data: %s", response_data)
                 return jsonify(response_data), 200
         except Exception as e:
             logger.error(f"POST /chat - Error processing request for User ID: {user_id}: {e}", exc_info=True)
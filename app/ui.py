@@ -1,6 +1,8 @@
 import gradio as gr
 import requests
+import json
 import os
+import uuid
 
 
 class AquariusUI:
@@ -34,7 +36,12 @@ class AquariusUI:
         return updated_history
 
     @staticmethod
-    def get_assistant_response(chat_history_state): 
+    def new_session_id():
+        """Id for one browser session, so each chat gets its own agent thread instead of sharing one"""
+        return uuid.uuid4().hex
+
+    @staticmethod
+    def get_assistant_response(chat_history_state, session_id="default"): 
         if not chat_history_state or chat_history_state[-1]["role"] != 'user':
             return chat_history_state # Should not happen in normal flow
 
@@ -49,7 +56,7 @@ class AquariusUI:
             return chat_history_state
 
         try:
-            payload = {"user_id": "default", "message": user_actual_message}
+            payload = {"user_id": session_id, "message": user_actual_message}
             print(f"DEBUG: Making API request to {AquariusUI.CHAT_API_URL} with payload: {payload}")
             response = requests.post(AquariusUI.CHAT_API_URL, json=payload, timeout=360)
             print(f"DEBUG: API response status: {response.status_code}")
@@ -96,6 +103,46 @@ class AquariusUI:
             updated_history.append({"role": "assistant", "content": error_msg})
             return updated_history
 
+    @classmethod
+    def stream_assistant_response(cls, chat_history_state, session_id="default"):
+        """Stream the reply from the API's server-sent events, yielding the updated history as text arrives"""
+        if not chat_history_state or chat_history_state[-1]["role"] != 'user':
+            yield chat_history_state, chat_history_state
+            return
+
+        user_actual_message = chat_history_state[-1]["content"]
+        base_history = [msg for msg in chat_history_state if not cls._is_processing_message(msg.get("content"))]
+        payload = {"user_id": session_id, "message": user_actual_message, "stream": True}
+        reply = ""
+        try:
+            with requests.post(cls.CHAT_API_URL, json=payload, timeout=360, stream=True) as response:
+                if response.status_code != 200:
+                    updated_history = base_history + [
+                        {"role": "assistant", "content": f"API Error {response.status_code}: {response.text}"}
+                    ]
+                    yield updated_history, updated_history
+                    return
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data: "):
+                        continue
+                    data = line[len("data: "):]
+                    if data == "[DONE]":
+                        break
+                    reply += json.loads(data).get("delta", "")
+                    visible = cls._clean_assistant_response(reply).split("<think>", 1)[0]
+                    if visible:
+                        updated_history = base_history + [{"role": "assistant", "content": visible}]
+                        yield updated_history, updated_history
+        except requests.exceptions.RequestException as e:
+            updated_history = base_history + [{"role": "assistant", "content": f"Request Error: {e}"}]
+            yield updated_history, updated_history
+            return
+
+        cleaned_reply = cls._clean_assistant_response(reply)
+        final_reply = cleaned_reply or "I received your message but couldn't generate a proper response."
+        updated_history = base_history + [{"role": "assistant", "content": final_reply}]
+        yield updated_history, updated_history
+
     @staticmethod
     def _clean_assistant_response(response: str) -> str:
         """Clean assistant response by removing thinking tags"""
@@ -157,6 +204,7 @@ class AquariusUI:
                     chat_history_ui = gr.Chatbot(label="Chat History", type="messages")
                     chat_input = gr.Textbox(lines=1, label="Your Message")
                     chat_state = gr.State([])
+                    session_id = gr.State(cls.new_session_id)
 
                     chat_input.submit(
                         fn=cls.add_user_message,
@@ -167,9 +215,9 @@ class AquariusUI:
                         inputs=[chat_state],
                         outputs=[chat_history_ui]
                     ).then(
-                        fn=cls.get_assistant_response,
-                        inputs=[chat_state],
-                        outputs=[chat_state]
+                        fn=cls.stream_assistant_response,
+                        inputs=[chat_state, session_id],
+                        outputs=[chat_state, chat_history_ui]
                     ).then(
                         fn=cls.final_sync_debug,
                         inputs=[chat_state],
@@ -9,4 +9,7 @@ exec opentelemetry-instrument \
         --port 8000 \
         --trust-remote-code \
         --dtype bfloat16 \
-        --quantization bitsandbytes
+        --quantization bitsandbytes \
+        --enable-prefix-caching \
+        --max-num-seqs 256 \
+        --speculative-config '{"method": "ngram", "num_speculative_tokens": 5, "prompt_lookup_max": 4}'
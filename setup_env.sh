@@ -54,6 +54,7 @@ fi
 echo "[5/6] Ollama is installed."
 
 # 6. Pull required Ollama models
+ollama pull qwen3:1.7b-q4_K_M || true
 ollama pull qwen3:8b || true
 ollama pull qwen3:32b || true
 
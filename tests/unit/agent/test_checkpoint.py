@@ -0,0 +1,48 @@
+import pytest
+
+# Mark all tests in this file as unit tests (fast with mocking)
+pytestmark = pytest.mark.unit
+from unittest.mock import patch
+from langgraph.checkpoint.base import empty_checkpoint
+from app.agent.checkpoint import BoundedMemorySaver
+
+
+def save(saver, thread_id):
+    """Write an empty checkpoint for the given thread."""
+    config = {"configurable": {"thread_id": thread_id, "checkpoint_ns": ""}}
+    saver.put(config, empty_checkpoint(), {}, {})
+
+
+class TestBoundedMemorySaver:
+    """Test cases for the bounded in-memory checkpointer."""
+
+    def test_keeps_threads_within_limit(self):
+        """Test that threads under the limit are all kept."""
+        saver = BoundedMemorySaver(max_threads=3)
+
+        for thread_id in ["a", "b", "c"]:
+            save(saver, thread_id)
+
+        assert set(saver.storage) == {"a", "b", "c"}
+
+    def test_evicts_least_recently_written_thread(self):
+        """Test that exceeding max_threads drops the least recently written thread."""
+        saver = BoundedMemorySaver(max_threads=2)
+
+        save(saver, "a")
+        save(saver, "b")
+        save(saver, "a")
+        save(saver, "c")
+
+        assert set(saver.storage) == {"a", "c"}
+
+    def test_evicts_idle_threads(self):
+        """Test that threads idle past idle_ttl are dropped on the next write."""
+        saver = BoundedMemorySaver(idle_ttl=60)
+
+        with patch('app.agent.checkpoint.time.monotonic', side_effect=[0, 50, 100]):
+            save(saver, "a")
+            save(saver, "b")
+            save(saver, "c")
+
+        assert set(saver.storage) == {"b", "c"}
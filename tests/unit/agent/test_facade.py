@@ -3,6 +3,7 @@ import pytest
 # Mark all tests in this file as unit tests (fast with mocking)
 pytestmark = pytest.mark.unit
 import asyncio
+import os
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from app.agent.facade import AgentFacade
 from app.server.models import AgentResponse
@@ -23,6 +24,18 @@ class MockHumanMessage(MockMessage):
         super().__init__(content=content, type="human")
 
 
+def streaming_agent(*messages, error=None):
+    """Build a mock agent whose astream yields one agent update with the given messages."""
+    async def astream(*args, **kwargs):
+        if error is not None:
+            raise error
+        yield {"agent": {"messages": list(messages)}}
+    
+    agent = Mock()
+    agent.astream = Mock(side_effect=astream)
+    return agent
+
+
 class TestAgentFacade:
     """Test cases for AgentFacade - simplified GitHub ReAct agent."""
 
@@ -35,6 +48,19 @@ class TestAgentFacade:
         assert facade._github_token is None
         assert hasattr(facade, '_initialization_lock')
         
+    def test_timeouts_read_once_at_construction(self, mock_config_manager):
+        """Test that configured timeouts are resolved to floats when the facade is created."""
+        mock_config_manager.get.side_effect = lambda key, default=None: {
+            "timeouts": {"mcp_init": 30, "llm_request": 120}
+        }.get(key, default)
+        
+        facade = AgentFacade(config_manager=mock_config_manager)
+        
+        assert facade._mcp_init_timeout == 30.0
+        assert facade._llm_request_timeout == 120.0
+        assert facade._mcp_cleanup_timeout == 20.0
+        assert facade._tool_call_timeout == 60.0
+
     @pytest.mark.asyncio
     @patch('app.agent.facade.LLMClient')
     @patch('app.agent.facade.MultiServerMCPClient')
@@ -52,13 +78,7 @@ class TestAgentFacade:
         mock_mcp_client.return_value = mock_mcp_instance
 
         # Mock agent response with proper message structure
-        mock_agent = AsyncMock()
-        mock_agent.ainvoke.return_value = {
-            "messages": [
-                MockHumanMessage(content="Tell me about microsoft/vscode"),
-                MockAIMessage(content="Repository summary completed.")
-            ]
-        }
+        mock_agent = streaming_agent(MockAIMessage(content="Repository summary completed."))
 
         facade = AgentFacade(config_manager=mock_config_manager)
 
@@ -78,10 +98,9 @@ class TestAgentFacade:
         mock_llm_instance.llm = mock_llm
         mock_llm_client.return_value = mock_llm_instance
         
-        mock_agent = AsyncMock()
-        mock_agent.ainvoke.return_value = {
-            "messages": [MockAIMessage(content="The repository has 3 recent commits with bug fixes and new features.")]
-        }
+        mock_agent = streaming_agent(
+            MockAIMessage(content="The repository has 3 recent commits with bug fixes and new features.")
+        )
 
         facade = AgentFacade(config_manager=mock_config_manager)
         
@@ -108,8 +127,7 @@ class TestAgentFacade:
         mock_mcp_instance.list_tools.return_value = []
         mock_mcp_client.return_value = mock_mcp_instance
 
-        mock_agent = AsyncMock()
-        mock_agent.ainvoke.side_effect = asyncio.TimeoutError()
+        mock_agent = streaming_agent(error=asyncio.TimeoutError())
         
         facade = AgentFacade(config_manager=mock_config_manager)
         
@@ -141,6 +159,19 @@ class TestAgentFacade:
             await facade.start()
             mock_init.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_start_prewarms_pooled_clients(self, mock_config_manager):
+        """Test that start creates the pooled LLM and MCP clients and warms the LLM before the first request."""
+        facade = AgentFacade(config_manager=mock_config_manager)
+        
+        with patch.object(facade, '_create_per_request_llm_client', new_callable=AsyncMock) as mock_llm, \
+             patch.object(facade, '_create_per_request_mcp_client', new_callable=AsyncMock) as mock_mcp:
+            await facade.start()
+        
+        mock_llm.assert_called_once_with()
+        mock_llm.return_value.awarm_up.assert_awaited_once()
+        mock_mcp.assert_called_once_with()
+
     @pytest.mark.asyncio
     async def test_stop_closes_resources(self, mock_config_manager):
         """Test that stop method closes resources."""
@@ -162,7 +193,7 @@ class TestAgentFacade:
             result = await facade._create_per_request_llm_client()
             
             assert result == mock_instance
-            mock_llm_client.assert_called_once_with(config_manager=mock_config_manager)
+            mock_llm_client.assert_called_once_with(config_manager=mock_config_manager, small=False)
 
     @pytest.mark.asyncio
     async def test_create_per_request_mcp_client_without_token(self, mock_config_manager):
@@ -188,3 +219,527 @@ class TestAgentFacade:
             # Should use fallback error message
             assert "technical issue" in result.lower()
             assert "try rephrasing" in result.lower()
+
+    @pytest.mark.asyncio
+    async def test_get_github_tools_returns_canonical_order(self, mock_config_manager):
+        """Test that selected tools follow the static priority order so the tool schema prefix is stable."""
+        facade = AgentFacade(config_manager=mock_config_manager)
+        tools = []
+        for name in ["list_commits", "get_file_contents", "search_repositories"]:
+            tool = Mock()
+            tool.name = name
+            tools.append(tool)
+        mock_client = Mock()
+        mock_client.get_tools.return_value = tools
+        
+        result = await facade._get_github_tools_from_client(mock_client)
+        
+        assert [tool.name for tool in result] == ["search_repositories", "get_file_contents", "list_commits"]
+
+    @pytest.mark.asyncio
+    async def test_github_tools_are_bounded_by_tool_timeout(self, mock_config_manager):
+        """Test that a slow GitHub tool times out instead of stalling the tool batch."""
+        from langchain_core.tools import StructuredTool
+        
+        async def slow_search(query: str) -> str:
+            await asyncio.sleep(1)
+            return query
+        
+        slow_tool = StructuredTool.from_function(coroutine=slow_search, name="search_code", description="Search code")
+        mock_client = Mock()
+        mock_client.get_tools.return_value = [slow_tool]
+        mock_config_manager.get.side_effect = lambda key, default=None: {"timeouts": {"tool_call": 0.01}}.get(key, default)
+        facade = AgentFacade(config_manager=mock_config_manager)
+        
+        tools = await facade._get_github_tools_from_client(mock_client)
+        
+        with pytest.raises(asyncio.TimeoutError):
+            await tools[0].ainvoke({"query": "asyncio"})
+
+    @pytest.mark.asyncio
+    async def test_github_tool_results_cached_per_commit(self, mock_config_manager):
+        """Test that an identical call pinned to a commit SHA reuses the result instead of calling GitHub."""
+        from langchain_core.tools import StructuredTool
+        
+        calls = []
+        
+        async def get_commit(owner: str, repo: str, sha: str) -> str:
+            calls.append(sha)
+            return f"commit {sha}"
+        
+        commit_tool = StructuredTool.from_function(coroutine=get_commit, name="get_commit", description="Get a commit")
+        mock_client = Mock()
+        mock_client.get_tools.return_value = [commit_tool]
+        facade = AgentFacade(config_manager=mock_config_manager)
+        sha = "a" * 40
+        
+        tools = await facade._get_github_tools_from_client(mock_client)
+        first = await tools[0].ainvoke({"owner": "o", "repo": "r", "sha": sha})
+        second = await tools[0].ainvoke({"owner": "o", "repo": "r", "sha": sha})
+        await tools[0].ainvoke({"owner": "o", "repo": "r", "sha": "main"})
+        await tools[0].ainvoke({"owner": "o", "repo": "r", "sha": "main"})
+        
+        assert first == second == f"commit {sha}"
+        assert calls == [sha, "main", "main"]
+        
+        await facade.close_resources()
+        assert not facade._tool_results
+
+    @pytest.mark.asyncio
+    async def test_github_tool_results_not_cached_when_mutable(self, mock_config_manager):
+        """Test that listings, which change over time, always reach GitHub."""
+        from langchain_core.tools import StructuredTool
+        
+        calls = []
+        
+        async def list_issues(owner: str, repo: str) -> str:
+            calls.append(repo)
+            return "open issues"
+        
+        issues_tool = StructuredTool.from_function(coroutine=list_issues, name="list_issues", description="List issues")
+        mock_client = Mock()
+        mock_client.get_tools.return_value = [issues_tool]
+        facade = AgentFacade(config_manager=mock_config_manager)
+        
+        tools = await facade._get_github_tools_from_client(mock_client)
+        await tools[0].ainvoke({"owner": "o", "repo": "r"})
+        await tools[0].ainvoke({"owner": "o", "repo": "r"})
+        
+        assert calls == ["r", "r"]
+        assert not facade._tool_results
+
+    @pytest.mark.asyncio
+    async def test_github_tool_errors_not_cached(self, mock_config_manager):
+        """Test that an error text returned by a pinned call is fetched again next time."""
+        from langchain_core.tools import StructuredTool
+        
+        calls = []
+        
+        async def get_commit(owner: str, repo: str, sha: str) -> str:
+            calls.append(sha)
+            return "failed to get commit: 502 Bad Gateway"
+        
+        commit_tool = StructuredTool.from_function(coroutine=get_commit, name="get_commit", description="Get a commit")
+        mock_client = Mock()
+        mock_client.get_tools.return_value = [commit_tool]
+        facade = AgentFacade(config_manager=mock_config_manager)
+        
+        tools = await facade._get_github_tools_from_client(mock_client)
+        await tools[0].ainvoke({"owner": "o", "repo": "r", "sha": "b" * 40})
+        await tools[0].ainvoke({"owner": "o", "repo": "r", "sha": "b" * 40})
+        
+        assert len(calls) == 2
+        assert not facade._tool_results
+
+    @pytest.mark.asyncio
+    @patch('app.agent.facade.LLMClient')
+    async def test_stream_yields_agent_text_chunks(self, mock_llm_client, mock_config_manager):
+        """Test that stream yields only model text chunks as they are generated."""
+        from langchain_core.messages import AIMessageChunk, ToolMessage
+        
+        async def fake_astream(*args, **kwargs):
+            yield AIMessageChunk(content="", tool_call_chunks=[{"name": "list_commits", "args": "{}", "id": "1", "index": 0}]), {"langgraph_node": "agent"}
+            yield ToolMessage(content="raw commits json", tool_call_id="1"), {"langgraph_node": "tools"}
+            yield AIMessageChunk(content="Recent "), {"langgraph_node": "agent"}
+            yield AIMessageChunk(content="commits"), {"langgraph_node": "agent"}
+        
+        mock_agent = Mock()
+        mock_agent.astream = fake_astream
+        facade = AgentFacade(config_manager=mock_config_manager)
+        
+        with patch.object(facade, '_create_per_request_mcp_client', new_callable=AsyncMock, return_value=(None, [])), \
+             patch('app.agent.facade.create_react_agent', return_value=mock_agent):
+            chunks = [chunk async for chunk in facade.stream("test_user", "Recent commits?")]
+        
+        assert chunks == ["Recent ", "commits"]
+
+    @pytest.mark.asyncio
+    @patch('app.agent.facade.LLMClient')
+    async def test_stream_timeout_yields_timeout_message(self, mock_llm_client, mock_config_manager):
+        """Test that a streamed run past the request timeout ends with the same reply invoke returns."""
+        from app.agent.facade import _TIMEOUT_MESSAGE
+        
+        async def slow_astream(*args, **kwargs):
+            await asyncio.sleep(10)
+            yield None
+        
+        mock_agent = Mock()
+        mock_agent.astream = slow_astream
+        mock_config_manager.get.side_effect = lambda key, default=None: {"timeouts": {"llm_request": 0.01}}.get(key, default)
+        facade = AgentFacade(config_manager=mock_config_manager)
+        
+        with patch.object(facade, '_create_per_request_mcp_client', new_callable=AsyncMock, return_value=(None, [])), \
+             patch('app.agent.facade.create_react_agent', return_value=mock_agent):
+            chunks = [chunk async for chunk in facade.stream("test_user", "Recent commits?")]
+        
+        assert chunks == [_TIMEOUT_MESSAGE]
+
+    @pytest.mark.asyncio
+    @patch('app.agent.facade.MultiServerMCPClient')
+    async def test_mcp_client_reused_across_requests(self, mock_mcp_client, mock_config_manager):
+        """Test that the MCP client is started once per event loop and reused by later requests."""
+        mock_manager = Mock()
+        mock_manager.__aenter__ = AsyncMock(return_value=Mock())
+        mock_manager.__aexit__ = AsyncMock()
+        mock_mcp_client.return_value = mock_manager
+        facade = AgentFacade(config_manager=mock_config_manager)
+        facade._github_token = "test_token"
+        
+        with patch.object(facade, '_get_github_tools_from_client', new_callable=AsyncMock, return_value=["tool"]):
+            first = await facade._create_per_request_mcp_client()
+            second = await facade._create_per_request_mcp_client()
+        
+        assert first == second == (mock_manager, ["tool"])
+        mock_mcp_client.assert_called_once()
+        mock_manager.__aexit__.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_close_resources_closes_pooled_mcp_client(self, mock_config_manager):
+        """Test that close_resources closes and forgets the pooled MCP client."""
+        mock_manager = Mock()
+        mock_manager.__aexit__ = AsyncMock()
+        facade = AgentFacade(config_manager=mock_config_manager)
+        facade._mcp_pool[asyncio.get_running_loop()] = (mock_manager, [])
+        
+        await facade.close_resources()
+        
+        mock_manager.__aexit__.assert_called_once()
+        assert facade._mcp_pool == {}
+
+    @pytest.mark.asyncio
+    @patch('app.agent.facade.LLMClient')
+    async def test_invoke_bounds_tool_loop_with_recursion_limit(self, mock_llm_client, mock_config_manager):
+        """Test that the agent runs with the configured recursion limit and a runaway loop keeps the MCP client."""
+        from langgraph.errors import GraphRecursionError
+        from app.agent.facade import _STEP_LIMIT_MESSAGE
+        
+        mock_config_manager.get.side_effect = lambda key, default=None: {"agent": {"recursion_limit": 6}}.get(key, default)
+        mock_agent = streaming_agent(error=GraphRecursionError("Recursion limit of 6 reached"))
+        facade = AgentFacade(config_manager=mock_config_manager)
+        
+        with patch('app.agent.facade.create_react_agent', return_value=mock_agent), \
+                patch.object(facade, '_evict_mcp_client', new_callable=AsyncMock) as mock_evict:
+            result = await facade.invoke("test_user", "Summarize every repository")
+        
+        assert mock_agent.astream.call_args.kwargs["config"]["recursion_limit"] == 6
+        assert not result.success
+        assert result.message == _STEP_LIMIT_MESSAGE
+        mock_evict.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch('app.agent.facade.LLMClient')
+    async def test_invoke_reuses_shared_system_message(self, mock_llm_client, mock_config_manager):
+        """Test that every request sends the same prebuilt system message."""
+        from app.agent.facade import _SYSTEM_MESSAGE
+        
+        mock_agent = streaming_agent(MockAIMessage(content="Done"))
+        facade = AgentFacade(config_manager=mock_config_manager)
+        
+        with patch('app.agent.facade.create_react_agent', return_value=mock_agent):
+            await facade.invoke("test_user", "First question")
+            await facade.invoke("test_user", "Second question")
+        
+        sent = [call.args[0]["messages"][0] for call in mock_agent.astream.call_args_list]
+        assert sent == [_SYSTEM_MESSAGE, _SYSTEM_MESSAGE]
+        assert all(message is _SYSTEM_MESSAGE for message in sent)
+
+    @pytest.mark.asyncio
+    async def test_llm_client_pooled_per_event_loop(self, mock_config_manager):
+        """Test that LLM clients are reused within an event loop, separately for the small model."""
+        facade = AgentFacade(config_manager=mock_config_manager)
+        
+        with patch('app.agent.facade.LLMClient', side_effect=lambda **kwargs: Mock(**kwargs)) as mock_llm_client:
+            first = await facade._create_per_request_llm_client()
+            second = await facade._create_per_request_llm_client()
+            small = await facade._create_per_request_llm_client(small=True)
+        
+        assert first is second
+        assert small is not first
+        assert mock_llm_client.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_close_resources_closes_pooled_llm_clients(self, mock_config_manager):
+        """Test that close_resources closes the pooled LLM clients of the running loop."""
+        llm_client = Mock()
+        llm_client.aclose = AsyncMock()
+        facade = AgentFacade(config_manager=mock_config_manager)
+        facade._llm_pool[asyncio.get_running_loop()] = {False: llm_client}
+        
+        await facade.close_resources()
+        
+        llm_client.aclose.assert_called_once()
+        assert len(facade._llm_pool) == 0
+
+    @pytest.mark.asyncio
+    async def test_get_github_tools_fills_room_with_additional_tools(self, mock_config_manager):
+        """Test that prefix-matched tools fill up to the cap after all priority tools."""
+        from app.agent.facade import _MAX_GITHUB_TOOLS, _PRIORITY_ORDER
+        
+        names = ["create_issue"] + [f"search_extra_{i}" for i in range(10)] + sorted(_PRIORITY_ORDER)
+        tools = []
+        for name in names:
+            tool = Mock()
+            tool.name = name
+            tools.append(tool)
+        mock_client = Mock()
+        mock_client.get_tools.return_value = tools
+        facade = AgentFacade(config_manager=mock_config_manager)
+        
+        result = [tool.name for tool in await facade._get_github_tools_from_client(mock_client)]
+        
+        assert len(result) == _MAX_GITHUB_TOOLS
+        assert result[:len(_PRIORITY_ORDER)] == list(_PRIORITY_ORDER)
+        assert result[len(_PRIORITY_ORDER):] == ["search_extra_0", "search_extra_1", "search_extra_2"]
+
+    @pytest.mark.asyncio
+    async def test_generate_error_response_uses_template_for_known_errors(self, mock_config_manager):
+        """Test that known error causes are answered without an LLM round trip."""
+        facade = AgentFacade(config_manager=mock_config_manager)
+        
+        with patch.object(facade, '_create_per_request_llm_client', new_callable=AsyncMock) as mock_create_llm:
+            timeout_reply = await facade._generate_error_response("MCP init timeout", "List commits")
+            llm_reply = await facade._generate_error_response("LLM client could not be created for this request", "Hi")
+        
+        assert "timed out" in timeout_reply.lower()
+        assert "language model" in llm_reply.lower()
+        mock_create_llm.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_slow_mcp_cleanup_finishes_in_background(self, mock_config_manager):
+        """Test that a cleanup exceeding its timeout is left running, tracked, instead of cancelled."""
+        finished = asyncio.Event()
+        
+        async def slow_exit(*args):
+            await asyncio.sleep(0.05)
+            finished.set()
+        
+        mock_manager = Mock()
+        mock_manager.__aexit__ = slow_exit
+        mock_config_manager.get.side_effect = lambda key, default=None: {"timeouts": {"mcp_cleanup": 0.01}}.get(key, default)
+        facade = AgentFacade(config_manager=mock_config_manager)
+        
+        await facade._cleanup_per_request_mcp(mock_manager)
+        
+        assert len(facade._background_tasks) == 1
+        await asyncio.wait_for(finished.wait(), timeout=1)
+        await asyncio.sleep(0)
+        assert facade._background_tasks == set()
+
+    @pytest.mark.asyncio
+    async def test_basic_setup_runs_once(self, mock_config_manager):
+        """Test that basic setup is skipped after the first success and rerun after close_resources."""
+        facade = AgentFacade(config_manager=mock_config_manager)
+        
+        with patch.object(facade, '_initialize_dependencies_if_needed', new_callable=AsyncMock) as mock_init:
+            await facade._initialize_basic_setup_if_needed()
+            await facade._initialize_basic_setup_if_needed()
+            assert mock_init.call_count == 1
+            
+            await facade.close_resources()
+            await facade._initialize_basic_setup_if_needed()
+            assert mock_init.call_count == 2
+
+    def test_extract_reply_and_history(self):
+        """Test that the last non-empty AI reply and the full history come from a single pass."""
+        from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+        
+        messages = [
+            HumanMessage(content="Recent commits?"),
+            AIMessage(content="", tool_calls=[{"name": "list_commits", "args": {}, "id": "1"}]),
+            ToolMessage(content="[]", tool_call_id="1"),
+            AIMessage(content="No recent commits."),
+            AIMessage(content=""),
+        ]
+        
+        reply, history = AgentFacade._extract_reply_and_history(messages)
+        
+        assert reply == "No recent commits."
+        assert history == [
+            ("human", "Recent commits?"),
+            ("ai", " [Used 1 tool(s)]"),
+            ("tool", "[]"),
+            ("ai", "No recent commits."),
+            ("ai", ""),
+        ]
+
+    @pytest.mark.asyncio
+    @patch('app.agent.facade.LLMClient')
+    async def test_invoke_timeout_cancels_agent_run(self, mock_llm_client, mock_config_manager):
+        """Test that an agent run exceeding the timeout is cancelled rather than left running."""
+        cancelled = asyncio.Event()
+        
+        async def slow_astream(*args, **kwargs):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            yield {}
+        
+        mock_agent = Mock()
+        mock_agent.astream = slow_astream
+        mock_config_manager.get.side_effect = lambda key, default=None: {"timeouts": {"llm_request": 0.01}}.get(key, default)
+        facade = AgentFacade(config_manager=mock_config_manager)
+        
+        with patch('app.agent.facade.create_react_agent', return_value=mock_agent):
+            result = await facade.invoke("test_user", "Test query")
+        
+        assert not result.success
+        assert "timed out" in result.message.lower()
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    @patch('app.agent.facade.LLMClient')
+    async def test_invoke_reports_progress_without_waiting(self, mock_llm_client, mock_config_manager):
+        """Test that progress steps are delivered in order but never block the request."""
+        release = asyncio.Event()
+        steps = []
+        
+        async def slow_progress(step, elapsed):
+            await release.wait()
+            steps.append(step)
+        
+        mock_agent = streaming_agent(MockAIMessage(content="Done"))
+        facade = AgentFacade(config_manager=mock_config_manager)
+        
+        with patch('app.agent.facade.create_react_agent', return_value=mock_agent):
+            result = await facade.invoke("test_user", "Hi", progress_callback=slow_progress)
+        
+        assert result.success
+        assert steps == []
+        release.set()
+        await asyncio.gather(*facade._background_tasks)
+        assert steps == [
+            "Starting basic initialization", "Basic initialization completed", "Creating fresh LLM client",
+            "Creating MCP client for this request", "Creating agent with tools", "Preparing agent messages",
+            "Starting agent execution", "Agent execution completed", "Request completed",
+        ]
+
+    @pytest.mark.asyncio
+    @patch('app.agent.facade.MultiServerMCPClient')
+    async def test_mcp_server_config_built_from_stored_token(self, mock_mcp_client, mock_config_manager):
+        """Test that the MCP server config reuses the env built when the token was stored."""
+        mock_config_manager.get.side_effect = lambda key, default=None: {"github_token": "ghp_test"}.get(key, default)
+        mock_manager = Mock()
+        mock_manager.__aenter__ = AsyncMock(return_value=Mock())
+        mock_mcp_client.return_value = mock_manager
+        facade = AgentFacade(config_manager=mock_config_manager)
+        await facade._initialize_dependencies_if_needed()
+        
+        with patch.object(facade, '_get_github_tools_from_client', new_callable=AsyncMock, return_value=[]):
+            await facade._create_per_request_mcp_client()
+        
+        server = mock_mcp_client.call_args[0][0]["github"]
+        assert server["env"] is facade._mcp_env
+        assert server["env"]["GITHUB_PERSONAL_ACCESS_TOKEN"] == "ghp_test"
+        assert server["args"][:4] == ["run", "-i", "--rm", "--name"]
+        assert server["args"][4].startswith(f"aquarius-github-mcp-{os.getpid()}-")
+        assert server["args"][-1] == "ghcr.io/github/github-mcp-server"
+
+    @pytest.mark.asyncio
+    @patch('app.agent.facade.LLMClient')
+    async def test_conversation_persists_across_requests(self, mock_llm_client, mock_config_manager):
+        """Test that the shared checkpointer keeps a thread's history across invoke calls."""
+        from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+        from langchain_core.messages import AIMessage
+        
+        mock_llm_client.return_value.llm = GenericFakeChatModel(
+            messages=iter([AIMessage(content="First answer"), AIMessage(content="Second answer")])
+        )
+        facade = AgentFacade(config_manager=mock_config_manager)
+        
+        await facade.invoke("test_user", "First question")
+        result = await facade.invoke("test_user", "Second question")
+        
+        assert result.message == "Second answer"
+        assert [content for role, content in result.history if role == "human"] == ["Second question"]
+        state = facade._checkpointer.get_tuple({"configurable": {"thread_id": "test_user"}})
+        stored = state.checkpoint["channel_values"]["messages"]
+        assert [m.content for m in stored if m.type == "human"] == ["First question", "Second question"]
+        assert [m.type for m in stored].count("system") == 1
+
+    @pytest.mark.asyncio
+    @patch('app.agent.facade.LLMClient')
+    async def test_timed_out_tool_call_does_not_break_thread(self, mock_llm_client, mock_config_manager):
+        """Test that a turn cut short during a tool call leaves the thread usable and the MCP client pooled."""
+        from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+        from langchain_core.messages import AIMessage
+        from langchain_core.tools import tool
+        
+        class ToolCallingFakeModel(GenericFakeChatModel):
+            def bind_tools(self, tools, **kwargs):
+                return self
+        
+        @tool
+        async def list_commits(repo: str) -> str:
+            """List recent commits of a repository."""
+            await asyncio.sleep(10)
+            return "commits"
+        
+        mock_llm_client.return_value.llm = ToolCallingFakeModel(messages=iter([
+            AIMessage(content="", tool_calls=[{"name": "list_commits", "args": {"repo": "a/b"}, "id": "call-1"}]),
+            AIMessage(content="Second answer"),
+        ]))
+        mock_config_manager.get.side_effect = lambda key, default=None: {"timeouts": {"llm_request": 0.2}}.get(key, default)
+        facade = AgentFacade(config_manager=mock_config_manager)
+        
+        with patch.object(facade, '_create_per_request_mcp_client', new_callable=AsyncMock, return_value=(None, [list_commits])), \
+                patch.object(facade, '_evict_mcp_client', new_callable=AsyncMock) as mock_evict:
+            first = await facade.invoke("test_user", "Recent commits in a/b?")
+            second = await facade.invoke("test_user", "Anything else?")
+        
+        assert "timed out" in first.message.lower()
+        assert second.success
+        assert second.message == "Second answer"
+        mock_evict.assert_not_called()
+
+    def test_model_input_bounds_earlier_turns(self, mock_config_manager):
+        """Test that earlier turns are reduced to questions and answers and trimmed, the current turn kept whole."""
+        from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+        from app.agent.facade import _SYSTEM_MESSAGE
+        
+        mock_config_manager.get.side_effect = lambda key, default=None: {"agent": {"history_messages": 2}}.get(key, default)
+        facade = AgentFacade(config_manager=mock_config_manager)
+        tool_call = AIMessage(content="", tool_calls=[{"name": "get_me", "args": {}, "id": "old"}])
+        current_call = AIMessage(content="", tool_calls=[{"name": "get_me", "args": {}, "id": "new"}])
+        current_result = ToolMessage(content="me", tool_call_id="new")
+        messages = [
+            _SYSTEM_MESSAGE,
+            HumanMessage(content="q1"), tool_call, ToolMessage(content="big payload", tool_call_id="old"), AIMessage(content="a1"),
+            HumanMessage(content="q2"), AIMessage(content="", tool_calls=[{"name": "get_me", "args": {}, "id": "dangling"}]),
+            HumanMessage(content="q3"), AIMessage(content="a3"),
+            HumanMessage(content="q4"), current_call, current_result,
+        ]
+        
+        sent = facade._model_input({"messages": messages})["llm_input_messages"]
+        
+        assert sent[0] is _SYSTEM_MESSAGE
+        assert [m.content for m in sent[1:3]] == ["q3", "a3"]
+        assert sent[3:] == messages[-3:]
+
+    @pytest.mark.asyncio
+    async def test_agent_compiled_once_per_llm_and_tools(self, mock_config_manager):
+        """Test that the ReAct agent is reused for the same LLM and tools and rebuilt for new tools."""
+        llm_client = Mock()
+        tools = [Mock(), Mock()]
+        facade = AgentFacade(config_manager=mock_config_manager)
+        
+        with patch('app.agent.facade.create_react_agent', side_effect=lambda **kwargs: Mock()) as mock_create:
+            first = await facade._create_per_request_agent(llm_client, tools)
+            second = await facade._create_per_request_agent(llm_client, list(tools))
+            third = await facade._create_per_request_agent(llm_client, tools[:1])
+        
+        assert first is second
+        assert third is not first
+        assert mock_create.call_count == 2
+
+    def test_extract_history_falls_back_to_message_type(self):
+        """Test that unknown message classes use their type attribute and non-str content is stringified."""
+        from langchain_core.messages import HumanMessage
+        
+        messages = [HumanMessage(content=[{"type": "text", "text": "Hi"}]), MockAIMessage(content="Hello")]
+        
+        reply, history = AgentFacade._extract_reply_and_history(messages)
+        
+        assert reply == "Hello"
+        assert history == [("human", "[{'type': 'text', 'text': 'Hi'}]"), ("ai", "Hello")]
@@ -83,7 +83,7 @@ class TestGraphModule:
             
             # Verify system prompt was used and contains all required GitHub context
             call_args = mock_create_react.call_args
-            state_modifier = call_args[1]['state_modifier']
+            state_modifier = call_args[1]['prompt'].content
             
             # Check for essential GitHub-focused assistant components
             assert "GitHub assistant" in state_modifier
@@ -121,3 +121,36 @@ class TestGraphModule:
         with patch('langgraph.graph.StateGraph', create=True) as mock_state_graph:
             build_github_react_agent(mock_config_manager, mock_llm, [])
             mock_state_graph.assert_not_called()
+
+    @patch('app.agent.graph.create_react_agent')
+    def test_agent_built_once_per_llm_and_tools(self, mock_create_react, mock_config_manager):
+        """Test that repeated builds with the same LLM and tools reuse the compiled agent."""
+        mock_llm = Mock()
+        mock_tools = [Mock(name="github_list_commits")]
+        mock_create_react.side_effect = lambda **kwargs: Mock()
+
+        first = build_github_react_agent(mock_config_manager, mock_llm, mock_tools)
+        second = build_github_react_agent(mock_config_manager, mock_llm, list(mock_tools))
+        other = build_github_react_agent(mock_config_manager, mock_llm, [])
+
+        assert first is second
+        assert other is not first
+        assert mock_create_react.call_count == 2
+
+    @patch('app.agent.graph.create_react_agent')
+    def test_agents_share_one_checkpointer_per_config(self, mock_create_react, mock_config_manager):
+        """Test that agents rebuilt for new tools keep using the same checkpointer."""
+        mock_llm = Mock()
+
+        build_github_react_agent(mock_config_manager, mock_llm, [Mock(name="github_list_commits")])
+        build_github_react_agent(mock_config_manager, mock_llm, [Mock(name="github_get_commit")])
+
+        first, second = (call.kwargs['checkpointer'] for call in mock_create_react.call_args_list)
+        assert first is second
+
+    def test_legacy_entry_points_alias_builder(self):
+        """Test that the older graph entry points are the single builder, not separate wrappers."""
+        from app.agent.graph import build_langgraph_with_config, get_graph
+
+        assert build_langgraph_with_config is build_github_react_agent
+        assert get_graph is build_github_react_agent
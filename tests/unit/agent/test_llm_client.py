@@ -3,7 +3,7 @@ import pytest
 # Mark all tests in this file as unit tests (fast with mocking)
 pytestmark = pytest.mark.unit
 import os
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from app.agent.llm_client import LLMClient
 from app.config_manager import ConfigManager
 
@@ -190,3 +190,67 @@ class TestLLMClient:
             base_url="http://host.docker.internal:11434",
             timeout=300
         )
+
+    @patch('app.agent.llm_client.ChatOllama')
+    def test_llm_client_small_model(self, mock_chat_ollama, mock_config_manager):
+        """Test that the small client uses llm_small_model for cheap side tasks."""
+        mock_config_manager.get.side_effect = lambda key, default=None: {
+            "test_mode": False,
+            "llm_model": "qwen3:32b",
+            "llm_small_model": "qwen3:8b",
+            "llm_base_url": "http://localhost:11434",
+            "timeouts": {"llm_request": 300}
+        }.get(key, default)
+        
+        LLMClient(mock_config_manager, small=True)
+        
+        mock_chat_ollama.assert_called_once_with(
+            model="qwen3:8b",
+            base_url="http://localhost:11434",
+            timeout=300
+        )
+
+    @patch('app.agent.llm_client.ChatOllama')
+    def test_llm_client_small_model_falls_back_to_llm_model(self, mock_chat_ollama, mock_config_manager):
+        """Test that the small client falls back to llm_model when no small model is configured."""
+        LLMClient(mock_config_manager, small=True)
+        
+        mock_chat_ollama.assert_called_once_with(
+            model="qwen3:32b",
+            base_url="http://localhost:11434",
+            timeout=300
+        )
+
+    @pytest.mark.asyncio
+    @patch('app.agent.llm_client.ChatOllama')
+    async def test_aclose_closes_async_http_client(self, mock_chat_ollama, mock_config_manager):
+        """Test that aclose closes the connection pool of the async Ollama client."""
+        http_client = Mock()
+        http_client.aclose = AsyncMock()
+        mock_chat_ollama.return_value._async_client._client = http_client
+        
+        await LLMClient(mock_config_manager).aclose()
+        
+        http_client.aclose.assert_called_once()
+
+    @pytest.mark.asyncio
+    @patch('app.agent.llm_client.ChatOllama')
+    async def test_awarm_up_loads_model(self, mock_chat_ollama, mock_config_manager):
+        """Test that awarm_up loads the model through the async client with an empty prompt."""
+        mock_chat_ollama.return_value.model = "qwen3:32b"
+        mock_chat_ollama.return_value._async_client.generate = AsyncMock()
+        
+        await LLMClient(mock_config_manager).awarm_up()
+        
+        mock_chat_ollama.return_value._async_client.generate.assert_awaited_once_with(model="qwen3:32b", prompt="")
+
+    @pytest.mark.asyncio
+    @patch('app.agent.llm_client.ChatOllama')
+    async def test_awarm_up_disabled_by_config(self, mock_chat_ollama, mock_config_manager):
+        """Test that awarm_up does nothing when llm_warmup is off."""
+        mock_config_manager.get.side_effect = lambda key, default=None: {"llm_warmup": False}.get(key, default)
+        mock_chat_ollama.return_value._async_client.generate = AsyncMock()
+        
+        await LLMClient(mock_config_manager).awarm_up()
+        
+        mock_chat_ollama.return_value._async_client.generate.assert_not_called()
@@ -0,0 +1,223 @@
+import pytest
+
+# Mark all tests in this file as unit tests (fast with mocking)
+pytestmark = pytest.mark.unit
+from unittest.mock import AsyncMock, Mock
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.tools import tool
+from app.agent.nodes import HISTORY_WINDOW, SUMMARY_TRIGGER, Nodes
+
+
+@tool
+def search_web(query: str) -> str:
+    """Search the web for the query."""
+    return query
+
+
+@tool
+def execute_python(code: str) -> str:
+    """Execute Python code in a sandbox."""
+    return code
+
+
+class TestNodes:
+    """Test cases for graph nodes and tool-call based routing."""
+
+    @pytest.fixture
+    def mock_facade(self):
+        """Mock facade exposing search and code tools."""
+        facade = Mock()
+        facade.search_tools = [search_web]
+        facade.code_tools = [execute_python]
+        return facade
+
+    @pytest.fixture
+    def nodes(self, mock_facade):
+        """Nodes instance backed by a mock model."""
+        model = Mock()
+        model.ainvoke = AsyncMock()
+        model.bind_tools.return_value = Mock(ainvoke=AsyncMock())
+        return Nodes(model, facade=mock_facade)
+
+    def test_tools_bound_to_model(self, mock_facade):
+        """Test that search and code tools are bound to the chatbot model once."""
+        model = Mock()
+        nodes = Nodes(model, facade=mock_facade)
+
+        model.bind_tools.assert_called_once_with([search_web, execute_python])
+        assert nodes.tool_model == model.bind_tools.return_value
+
+    @pytest.mark.asyncio
+    async def test_chatbot_node_uses_tool_model(self, nodes):
+        """Test that chatbot_node makes a single call to the tool-bound model."""
+        nodes.tool_model.ainvoke.return_value = AIMessage(content="Hi!")
+
+        result = await nodes.chatbot_node({"messages": [HumanMessage(content="Hello")]})
+
+        nodes.tool_model.ainvoke.assert_awaited_once()
+        nodes.model.ainvoke.assert_not_called()
+        assert result["messages"][0].content == "Hi!"
+
+    def test_choose_next_node_routes_search(self, nodes):
+        """Test routing to the search node on a search tool call."""
+        msg = AIMessage(content="", tool_calls=[{"name": "search_web", "args": {"query": "x"}, "id": "1"}])
+
+        assert nodes.choose_next_node({"messages": [msg]}) == "search_node"
+
+    def test_choose_next_node_routes_code(self, nodes):
+        """Test routing to the code node on a code tool call."""
+        msg = AIMessage(content="", tool_calls=[{"name": "execute_python", "args": {"code": "1"}, "id": "1"}])
+
+        assert nodes.choose_next_node({"messages": [msg]}) == "code_node"
+
+    def test_choose_next_node_ends_without_tool_calls(self, nodes):
+        """Test that a plain answer ends the turn."""
+        msg = AIMessage(content="Just chatting")
+
+        assert nodes.choose_next_node({"messages": [msg]}) == "end_node"
+
+    @pytest.mark.asyncio
+    async def test_chatbot_node_system_prompt_starts_with_static_block(self, nodes):
+        """Test that the date goes after the static instructions so the prompt prefix stays cacheable."""
+        from app.agent.prompts import SYSTEM_PROMPT_STATIC
+        nodes.tool_model.ainvoke.return_value = AIMessage(content="Hi!")
+
+        await nodes.chatbot_node({"messages": [HumanMessage(content="Hello")]})
+
+        system_prompt = nodes.tool_model.ainvoke.call_args[0][0][0].content
+        assert system_prompt.startswith(SYSTEM_PROMPT_STATIC)
+        assert system_prompt.rstrip(".").endswith(tuple("0123456789"))
+
+    @pytest.mark.asyncio
+    async def test_chatbot_node_keeps_short_history(self, nodes):
+        """Test that a short conversation is sent in full without summarizing."""
+        nodes.tool_model.ainvoke.return_value = AIMessage(content="Sure")
+        messages = [HumanMessage(content="Hello", id="1"), AIMessage(content="Hi", id="2")]
+
+        result = await nodes.chatbot_node({"messages": messages})
+
+        nodes.model.ainvoke.assert_not_called()
+        sent = nodes.tool_model.ainvoke.call_args[0][0]
+        assert sent[1:] == messages
+        assert result["messages"] == [nodes.tool_model.ainvoke.return_value]
+        assert result["summary"] == ""
+
+    @pytest.mark.asyncio
+    async def test_chatbot_node_summarizes_beyond_window(self, nodes):
+        """Test that past the trigger a new turn folds everything outside the window into the summary."""
+        nodes.model.ainvoke.return_value = AIMessage(content="User asked about repos.")
+        nodes.tool_model.ainvoke.return_value = AIMessage(content="Done")
+        messages = [HumanMessage(content=f"msg {i}", id=str(i)) for i in range(SUMMARY_TRIGGER + 3)]
+
+        result = await nodes.chatbot_node({"messages": messages, "summary": "Earlier chat."})
+
+        nodes.model.ainvoke.assert_awaited_once()
+        sent = nodes.tool_model.ainvoke.call_args[0][0]
+        assert "User asked about repos." in sent[1].content
+        assert sent[2:] == messages[-HISTORY_WINDOW:]
+        removed_ids = [m.id for m in result["messages"][:-1]]
+        assert removed_ids == [str(i) for i in range(SUMMARY_TRIGGER + 3 - HISTORY_WINDOW)]
+        assert result["summary"] == "User asked about repos."
+
+    @pytest.mark.asyncio
+    async def test_chatbot_node_waits_for_trigger(self, nodes):
+        """Test that a history just past the window is sent whole instead of summarized on every turn."""
+        nodes.tool_model.ainvoke.return_value = AIMessage(content="Done")
+        messages = [HumanMessage(content=f"msg {i}", id=str(i)) for i in range(HISTORY_WINDOW + 3)]
+
+        await nodes.chatbot_node({"messages": messages, "summary": "Earlier chat."})
+
+        nodes.model.ainvoke.assert_not_called()
+        assert nodes.tool_model.ainvoke.call_args[0][0][2:] == messages
+
+    @pytest.mark.asyncio
+    async def test_chatbot_node_does_not_summarize_after_tool_result(self, nodes):
+        """Test that hops after a tool result go straight to the model even past the trigger."""
+        nodes.tool_model.ainvoke.return_value = AIMessage(content="Done")
+        messages = [HumanMessage(content=f"msg {i}", id=str(i)) for i in range(SUMMARY_TRIGGER + 3)]
+        messages.append(ToolMessage(content="result", tool_call_id="call-1", id="tool"))
+
+        result = await nodes.chatbot_node({"messages": messages})
+
+        nodes.model.ainvoke.assert_not_called()
+        assert result["messages"] == [nodes.tool_model.ainvoke.return_value]
+
+    def test_tool_routes_precomputed(self, nodes):
+        """Test that the tool name to node lookup is built once at init."""
+        assert nodes.tool_routes == {"search_web": "search_node", "execute_python": "code_node"}
+
+    def test_shared_tool_bound_once(self, mock_facade):
+        """Test that a tool listed as both search and code is sent to the model once."""
+        mock_facade.code_tools = [execute_python, search_web]
+        model = Mock()
+
+        nodes = Nodes(model, facade=mock_facade)
+
+        model.bind_tools.assert_called_once_with([search_web, execute_python])
+        assert nodes.tool_routes["search_web"] == "search_node"
+
+    def test_first_tool_with_a_name_wins(self, mock_facade):
+        """Test that a same-named code tool does not replace the search tool that routing points to."""
+        @tool("search_web")
+        def other_search_web(query: str) -> str:
+            """Another tool with the same name."""
+            return query
+
+        mock_facade.code_tools = [execute_python, other_search_web]
+        model = Mock()
+
+        Nodes(model, facade=mock_facade)
+
+        model.bind_tools.assert_called_once_with([search_web, execute_python])
+
+    @pytest.mark.asyncio
+    async def test_summary_uses_small_model(self, mock_facade):
+        """Test that history summaries go to the small model, not the tool-calling model."""
+        model = Mock()
+        small_model = Mock()
+        small_model.ainvoke = AsyncMock(return_value=AIMessage(content="Short summary"))
+        nodes = Nodes(model, facade=mock_facade, small_model=small_model)
+
+        summary = await nodes.summarize_history("", [HumanMessage(content="Hello")])
+
+        assert summary == "Short summary"
+        small_model.ainvoke.assert_awaited_once()
+        model.ainvoke.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_human_node_reuses_question_for_same_prompt(self, nodes):
+        """Test that an identical clarification prompt is answered from the cache without a model call."""
+        nodes.model.ainvoke.return_value = AIMessage(content="Which repository do you mean?", id="q1")
+        state = {"messages": [HumanMessage(content="Show me the repo")]}
+
+        first = await nodes.human_node(state)
+        second = await nodes.human_node(state)
+
+        nodes.model.ainvoke.assert_awaited_once()
+        assert first["messages"][0].content == second["messages"][0].content == "Which repository do you mean?"
+        assert second["messages"][0].id != "q1"
+
+    @pytest.mark.asyncio
+    async def test_human_node_renders_only_recent_window(self, nodes):
+        """Test that the clarification prompt holds the summary and the recent window, not the whole thread."""
+        nodes.model.ainvoke.return_value = AIMessage(content="Which one?")
+        messages = [HumanMessage(content=f"msg {i}") for i in range(HISTORY_WINDOW + 5)]
+
+        await nodes.human_node({"messages": messages, "summary": "Talked about repos."})
+
+        prompt = nodes.model.ainvoke.call_args[0][0][0].content
+        assert "Summary: Talked about repos." in prompt
+        assert "User: msg 3" not in prompt
+        assert "User: msg 4" in prompt
+        assert prompt.count("User: msg") == HISTORY_WINDOW
+
+    @pytest.mark.asyncio
+    async def test_system_prompt_built_once_per_day(self, nodes):
+        """Test that consecutive turns on the same day reuse the same system prompt string."""
+        nodes.tool_model.ainvoke.return_value = AIMessage(content="Hi!")
+
+        await nodes.chatbot_node({"messages": [HumanMessage(content="Hello")]})
+        await nodes.chatbot_node({"messages": [HumanMessage(content="Again")]})
+
+        first, second = (call[0][0][0].content for call in nodes.tool_model.ainvoke.call_args_list)
+        assert first is second
@@ -0,0 +1,121 @@
+import pytest
+
+# Mark all tests in this file as unit tests (fast with mocking)
+pytestmark = pytest.mark.unit
+import requests
+from unittest.mock import Mock, patch
+from app.agent.tools.search.arxiv import ArxivSearch, format_results_as_markdown
+
+
+def results_page(*ids):
+    """Build an arXiv search results page holding one entry per id."""
+    items = "".join(
+        f'<li class="arxiv-result">'
+        f'<p class="list-title"><a href="https://arxiv.org/abs/{i}">arXiv:{i}</a></p>'
+        f'<p class="title">Paper {i}</p>'
+        f'<p class="authors">Authors:\n  Ada   Lovelace</p>'
+        f'<span class="abstract-full">Abstract {i} △ Less</span>'
+        f'</li>'
+        for i in ids
+    )
+    return Mock(content=f"<ol>{items}</ol>".encode(), raise_for_status=Mock())
+
+
+class TestArxivSearch:
+    """Test cases for arXiv search pagination."""
+
+    @pytest.fixture(autouse=True)
+    def clear_page_cache(self):
+        """Start every test with an empty page cache."""
+        ArxivSearch.fetch_page.cache_clear()
+
+    @patch.object(ArxivSearch.session, "get")
+    def test_small_request_uses_single_page(self, mock_get):
+        """Test that up to 200 results are fetched with one request of the smallest fitting size."""
+        mock_get.return_value = results_page("1", "2", "3")
+
+        results = ArxivSearch.search("transformers", max_results=2)
+
+        mock_get.assert_called_once()
+        assert mock_get.call_args.kwargs["params"]["size"] == "25"
+        assert [r["link"] for r in results] == ["https://arxiv.org/abs/1", "https://arxiv.org/abs/2"]
+        assert results[0]["authors"] == "Ada Lovelace"
+        assert results[0]["abstract"] == "Abstract 1"
+
+    @patch.object(ArxivSearch.session, "get")
+    def test_large_request_fetches_pages_and_dedupes(self, mock_get):
+        """Test that every page is fetched, results keep page order and repeated papers are dropped."""
+        pages = {"0": results_page("1", "2"), "200": results_page("2", "3")}
+        mock_get.side_effect = lambda url, params, timeout: pages[params["start"]]
+
+        results = ArxivSearch.search("transformers", max_results=250)
+
+        assert mock_get.call_count == 2
+        assert [r["link"] for r in results] == [f"https://arxiv.org/abs/{i}" for i in ("1", "2", "3")]
+
+    @patch.object(ArxivSearch.session, "get")
+    def test_failed_page_is_skipped(self, mock_get):
+        """Test that an error on one page does not drop the results of the others."""
+        def get(url, params, timeout):
+            if params["start"] == "200":
+                raise ConnectionError("boom")
+            return results_page("1")
+        mock_get.side_effect = get
+
+        results = ArxivSearch.search("transformers", max_results=300)
+
+        assert [r["link"] for r in results] == ["https://arxiv.org/abs/1"]
+
+    @patch.object(ArxivSearch.session, "get")
+    def test_repeated_page_served_from_cache(self, mock_get):
+        """Test that the same page for the same query is fetched once."""
+        mock_get.return_value = results_page("1")
+
+        ArxivSearch.search("Transformers", max_results=5)
+        results = ArxivSearch.search("transformers ", max_results=10)
+
+        mock_get.assert_called_once()
+        assert [r["link"] for r in results] == ["https://arxiv.org/abs/1"]
+
+    @patch.object(ArxivSearch.session, "get")
+    def test_empty_page_not_cached(self, mock_get):
+        """Test that a page without results is fetched again on the next search."""
+        mock_get.side_effect = [results_page(), results_page("1")]
+
+        first = ArxivSearch.search("transformers", max_results=5)
+        second = ArxivSearch.search("transformers", max_results=5)
+
+        assert first == []
+        assert [r["link"] for r in second] == ["https://arxiv.org/abs/1"]
+        assert mock_get.call_count == 2
+
+    @patch.object(ArxivSearch.session, "get")
+    def test_error_status_not_cached(self, mock_get):
+        """Test that an error response such as a 503 is not parsed or cached."""
+        unavailable = results_page()
+        unavailable.raise_for_status.side_effect = requests.HTTPError("503 Service Unavailable")
+        mock_get.side_effect = [unavailable, results_page("1")]
+
+        first = ArxivSearch.search("transformers", max_results=5)
+        second = ArxivSearch.search("transformers", max_results=5)
+
+        assert first == []
+        assert [r["link"] for r in second] == ["https://arxiv.org/abs/1"]
+        assert mock_get.call_count == 2
+
+
+class TestFormatResultsAsMarkdown:
+    """Test cases for rendering arXiv results."""
+
+    def test_numbered_entries(self):
+        """Test that each paper becomes a numbered section with its details."""
+        papers = [
+            {"title": f"Paper {i}", "authors": "Ada", "abstract": f"Abstract {i}", "link": f"https://arxiv.org/abs/{i}"}
+            for i in (1, 2)
+        ]
+
+        md = format_results_as_markdown(papers)
+
+        assert md.startswith("# arXiv Search Results\n\n## 1. Paper 1\n**Authors:** Ada\n\n")
+        assert "## 2. Paper 2\n" in md
+        assert md.endswith("**Link:** [View Paper](https://arxiv.org/abs/2)\n\n")
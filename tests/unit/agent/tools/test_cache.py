@@ -0,0 +1,65 @@
+import pytest
+
+# Mark all tests in this file as unit tests (fast with mocking)
+pytestmark = pytest.mark.unit
+from unittest.mock import Mock, patch
+from app.agent.tools.cache import ttl_cache
+
+
+class TestTTLCache:
+    """Test cases for the search tool TTL cache."""
+
+    def test_repeated_normalized_query_hits_cache(self):
+        """Test that queries differing only in case and whitespace share one call."""
+        search = Mock(return_value="results")
+        cached_search = ttl_cache()(search)
+
+        assert cached_search("LangGraph ") == "results"
+        assert cached_search("  langgraph") == "results"
+        search.assert_called_once_with("LangGraph ")
+
+    def test_extra_arguments_are_part_of_key(self):
+        """Test that different non-query arguments are cached separately."""
+        search = Mock(return_value="results")
+        cached_search = ttl_cache()(search)
+
+        cached_search("python", "all")
+        cached_search("python", "learnpython")
+
+        assert search.call_count == 2
+
+    def test_entries_expire_after_ttl(self):
+        """Test that an expired entry triggers a fresh call."""
+        search = Mock(return_value="results")
+        cached_search = ttl_cache(ttl=10)(search)
+
+        with patch('app.agent.tools.cache.time.monotonic', side_effect=[0, 5, 20]):
+            cached_search("python")
+            cached_search("python")
+            cached_search("python")
+
+        assert search.call_count == 2
+
+    def test_none_results_are_not_cached(self):
+        """Test that failed lookups returning None are retried."""
+        search = Mock(return_value=None)
+        cached_search = ttl_cache()(search)
+
+        cached_search("python")
+        cached_search("python")
+
+        assert search.call_count == 2
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test that the cache stays within maxsize."""
+        search = Mock(side_effect=lambda query: query)
+        cached_search = ttl_cache(maxsize=2)(search)
+
+        cached_search("a")
+        cached_search("b")
+        cached_search("a")
+        cached_search("c")
+        cached_search("a")
+        cached_search("b")
+
+        assert search.call_count == 4
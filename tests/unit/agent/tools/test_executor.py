@@ -0,0 +1,32 @@
+import pytest
+
+# Mark all tests in this file as unit tests (fast with mocking)
+pytestmark = pytest.mark.unit
+import threading
+from app.agent.tools.executor import offload
+
+
+def blocking_tool(query: str, limit: int = 1) -> tuple:
+    """Return the query, limit and the name of the executing thread."""
+    return query, limit, threading.current_thread().name
+
+blocking_tool.name = "blocking_tool"
+
+
+class TestOffload:
+    """Test cases for running blocking tools on the shared tool pool."""
+
+    @pytest.mark.asyncio
+    async def test_offload_runs_on_tool_pool(self):
+        """Test that the async variant runs the blocking function on a pool thread."""
+        query, limit, thread_name = await offload(blocking_tool)("python", limit=3)
+
+        assert (query, limit) == ("python", 3)
+        assert thread_name.startswith("aquarius-tool")
+
+    def test_offload_preserves_tool_metadata(self):
+        """Test that tool discovery attributes are kept on the async variant."""
+        async_tool = offload(blocking_tool)
+
+        assert async_tool.__name__ == "blocking_tool"
+        assert async_tool.name == "blocking_tool"
@@ -0,0 +1,40 @@
+import pytest
+
+# Mark all tests in this file as unit tests (fast with mocking)
+pytestmark = pytest.mark.unit
+from unittest.mock import patch
+from app.agent.tools.http import POOL_MAXSIZE, RETRY, create_session
+
+
+class TestCreateSession:
+    """Test cases for the shared keep-alive HTTP session factory."""
+
+    def test_pool_sized_for_tool_pool(self):
+        """Test that both schemes use a connection pool sized for the tool pool."""
+        session = create_session()
+
+        for scheme in ("https://", "http://"):
+            assert session.get_adapter(f"{scheme}example.com")._pool_maxsize == POOL_MAXSIZE
+
+    def test_transient_errors_retried(self):
+        """Test that both schemes retry throttled and gateway errors with Retry-After back-off."""
+        session = create_session()
+
+        for scheme in ("https://", "http://"):
+            retries = session.get_adapter(f"{scheme}example.com").max_retries
+            assert retries is RETRY
+        assert {429, 503} <= set(RETRY.status_forcelist)
+        assert RETRY.respect_retry_after_header
+
+    def test_default_headers_applied(self):
+        """Test that default headers are set on the session."""
+        session = create_session(headers={"User-Agent": "aquarius"})
+
+        assert session.headers["User-Agent"] == "aquarius"
+
+    def test_session_closed_at_exit(self):
+        """Test that the session is registered for closing at interpreter exit."""
+        with patch("app.agent.tools.http.atexit.register") as mock_register:
+            session = create_session()
+
+        mock_register.assert_called_once_with(session.close)
@@ -0,0 +1,108 @@
+import pytest
+
+# Mark all tests in this file as unit tests (fast with mocking)
+pytestmark = pytest.mark.unit
+from unittest.mock import patch
+from app.agent.tools.execution import sandbox as sandbox_module
+from app.agent.tools.execution.python import PythonCodeExecutor
+
+
+class TestPythonCodeExecutor:
+    """Test cases for the sandboxed Python code executor."""
+
+    @pytest.fixture
+    def executor(self):
+        """Executor whose sandbox worker is stopped after the test."""
+        executor = PythonCodeExecutor()
+        yield executor
+        executor.close()
+
+    def test_execute_captures_output(self, executor):
+        """Test that printed output is returned."""
+        assert executor.execute("print(6 * 7)") == "42\n"
+
+    def test_execute_reports_syntax_error(self, executor):
+        """Test that a syntax error is reported without starting the sandbox."""
+        assert executor.execute("print(").startswith("Syntax Error:")
+        assert executor._worker is None
+
+    def test_execute_compiles_snippet_once(self, executor):
+        """Test that repeated snippets are linted from the compiled code cache."""
+        code = "print('compiled once')"
+        sandbox_module.compile_snippet.cache_clear()
+
+        with patch('builtins.compile', wraps=compile) as mock_compile:
+            executor.execute(code)
+            executor.execute(code)
+
+        assert [call.args[0] for call in mock_compile.call_args_list].count(code) == 1
+
+    def test_execute_runs_outside_server_process(self, executor):
+        """Test that snippets run in the sandbox worker and the worker is reused."""
+        first = executor.execute("import os; print(os.getpid())")
+        second = executor.execute("import os; print(os.getpid())")
+
+        assert first == second
+        assert int(first) != __import__("os").getpid()
+
+    def test_execute_times_out_and_keeps_worker(self):
+        """Test that a runaway snippet is stopped inside the worker, which then serves the next call."""
+        executor = PythonCodeExecutor(timeout=1)
+        try:
+            before = executor.execute("import os; print(os.getpid())")
+            result = executor.execute("while True:\n    try:\n        pass\n    except Exception:\n        pass")
+            after = executor.execute("import os; print(os.getpid())")
+        finally:
+            executor.close()
+
+        assert "timed out after 1s" in result
+        assert after == before
+
+    def test_unresponsive_worker_is_killed_and_replaced(self):
+        """Test that a snippet that swallows the timeout while blocked gets its worker killed."""
+        executor = PythonCodeExecutor(timeout=1)
+        try:
+            executor.execute("pass")
+            stuck_worker = executor._worker
+            result = executor.execute(
+                "import time\nwhile True:\n    try:\n        time.sleep(10)\n    except BaseException:\n        pass"
+            )
+            recovered = executor.execute("print('ok')")
+        finally:
+            executor.close()
+
+        assert "timed out after 1s" in result
+        assert stuck_worker.process.poll() is not None
+        assert recovered == "ok\n"
+
+    def test_close_stops_worker(self, executor):
+        """Test that closing the executor leaves no worker process behind."""
+        executor.execute("pass")
+        worker = executor._worker
+
+        executor.close()
+
+        assert worker.process.poll() is not None
+        assert executor._worker is None
+
+    def test_worker_does_not_load_server_modules(self, executor):
+        """Test that the worker starts from the sandbox entry module without the server's __main__."""
+        result = executor.execute(
+            "import sys; print(sys.modules['__main__'].__file__.endswith('sandbox.py'),"
+            " sorted(m for m in sys.modules if m.split('.')[0] in ('app', 'gradio')))"
+        )
+
+        assert result == "True []\n"
+
+    def test_preload_fits_memory_cap(self, executor):
+        """Test that the worker starts with numpy and pandas preloaded under the address space cap."""
+        result = executor.execute("import sys; print('numpy' in sys.modules, 'pandas' in sys.modules)")
+
+        assert result == "True True\n"
+
+    def test_run_snippet_caps_captured_output(self):
+        """Test that output beyond the cap is dropped and marked as truncated."""
+        with patch.object(sandbox_module, 'SANDBOX_MAX_OUTPUT_CHARS', 10):
+            output = sandbox_module.run_snippet("for _ in range(1000): print('x' * 100)")
+
+        assert output.startswith("x" * 10 + "\n[output truncated after 10 characters]")
@@ -0,0 +1,24 @@
+import pytest
+
+# Mark all tests in this file as unit tests (fast with mocking)
+pytestmark = pytest.mark.unit
+from app.agent.tools.search.reddit import format_results_as_markdown
+
+
+class TestFormatResultsAsMarkdown:
+    """Test cases for rendering Reddit results."""
+
+    def test_post_sections(self):
+        """Test that each post becomes a section with subreddit, score, UTC time and link."""
+        posts = [{"title": "Hello", "subreddit": "python", "score": 42, "created_utc": 0, "url": "https://redd.it/1"}]
+
+        md = format_results_as_markdown(posts)
+
+        assert md == (
+            "# Reddit Search Results\n\n"
+            "## Hello\n"
+            "- **Subreddit:** python\n"
+            "- **Score:** 42\n"
+            "- **Created:** 1970-01-01 00:00:00 UTC\n"
+            "- **URL:** [Link](https://redd.it/1)\n\n"
+        )
@@ -0,0 +1,48 @@
+import pytest
+
+# Mark all tests in this file as unit tests (fast with mocking)
+pytestmark = pytest.mark.unit
+import os
+from unittest.mock import Mock, patch
+from app.agent.tools.execution.terminal import execute_terminal_command, is_command_allowed
+
+
+class TestIsCommandAllowed:
+    """Test cases for the terminal command allow and deny lists."""
+
+    def test_allowed_prefixes(self):
+        """Test that commands starting with an allowed prefix pass."""
+        assert is_command_allowed("ls -la")
+        assert is_command_allowed("git status --short")
+        assert is_command_allowed('echo "hi"')
+
+    def test_denied_prefixes_take_precedence(self):
+        """Test that denied prefixes are rejected even when not otherwise allowed."""
+        assert not is_command_allowed("rm -rf /")
+        assert not is_command_allowed("sudo ls")
+
+    def test_unlisted_commands_denied(self):
+        """Test that commands on neither list are denied by default."""
+        assert not is_command_allowed("git push")
+        assert not is_command_allowed("")
+
+
+class TestExecuteTerminalCommand:
+    """Test cases for running allowed terminal commands."""
+
+    @patch("app.agent.tools.execution.terminal.subprocess.run")
+    def test_trivial_commands_skip_subprocess(self, mock_run):
+        """Test that plain echo and pwd are answered without spawning a process."""
+        assert execute_terminal_command('echo "Hello   World" again') == ("Hello   World again\n", "", 0)
+        assert execute_terminal_command("pwd") == (os.getcwd() + "\n", "", 0)
+        mock_run.assert_not_called()
+
+    @patch("app.agent.tools.execution.terminal.subprocess.run")
+    def test_builtin_with_options_uses_subprocess(self, mock_run):
+        """Test that echo options and other commands still go to the real binary."""
+        mock_run.return_value = Mock(stdout="hi", stderr="", returncode=0)
+
+        assert execute_terminal_command("echo -n hi") == ("hi", "", 0)
+        execute_terminal_command("ls -la")
+
+        assert [call[0][0] for call in mock_run.call_args_list] == [["echo", "-n", "hi"], ["ls", "-la"]]
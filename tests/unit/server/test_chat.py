@@ -3,6 +3,8 @@ import pytest
 # Mark all tests in this file as unit tests (fast with mocking)
 pytestmark = pytest.mark.unit
 import asyncio
+import os
+import threading
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 from app.server.chat import ChatService
 from app.server.models import AgentResponse
@@ -57,6 +59,40 @@ class TestChatService:
         
         assert result == expected
 
+    def test_api_timeout_read_once_at_construction(self):
+        """Test that the API timeout comes from the config loaded at construction."""
+        config = {"timeouts": {"api_request": 42}}
+        with patch('app.server.chat.configManager') as mock_config:
+            mock_config.get.side_effect = lambda key, default=None: config.get(key, default)
+            chat_service = ChatService()
+        
+        try:
+            assert chat_service._api_request_timeout == 42.0
+        finally:
+            chat_service.shutdown()
+
+    def test_test_mode_read_per_request(self):
+        """Test that TEST_MODE set after the service was built still selects the long API timeout."""
+        self.chat_service._api_request_timeout = 0.5
+        
+        async def invoke(user_id, message):
+            return AgentResponse(success=True, message="ok", history=[("user", message), ("assistant", "ok")])
+        
+        self.chat_service.agent_facade = Mock()
+        self.chat_service.agent_facade.invoke = invoke
+        
+        with patch.dict(os.environ, {"TEST_MODE": "true"}), patch('app.server.chat.asyncio.wait_for', wraps=asyncio.wait_for) as mock_wait_for:
+            reply, _ = self.chat_service.process_message("test_user", "Hello there")
+        
+        assert reply == "ok"
+        assert mock_wait_for.call_args.kwargs["timeout"] == 0.5
+
+    def test_is_github_request(self):
+        """Test keyword-based detection of GitHub-related requests."""
+        assert self.chat_service._is_github_request("Show recent Commits in owner/repo")
+        assert self.chat_service._is_github_request("Any open PULL REQUEST?")
+        assert not self.chat_service._is_github_request("Hello, how are you?")
+
     def test_process_message_success(self):
         """Test successful message processing."""
         # Setup mock agent response
@@ -152,6 +188,105 @@ class TestChatService:
         finally:
             loop.close()
 
+    def test_process_message_cancelled(self):
+        """Test that a cancelled agent run gets the interruption reply instead of the generic error."""
+        async def cancelled_invoke(user_id, message):
+            raise asyncio.CancelledError()
+        
+        self.chat_service.agent_facade = Mock()
+        self.chat_service.agent_facade.invoke = cancelled_invoke
+        
+        reply, history = self.chat_service.process_message("test_user", "Tell me about repo")
+        
+        assert reply == "My response was interrupted. Please try again."
+        assert history[1] == {"role": "assistant", "content": reply}
+
+    def test_run_timeout_cancels_coroutine(self):
+        """Test that a coroutine outliving the caller's timeout is cancelled on the loop."""
+        cancelled = threading.Event()
+        
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        
+        with pytest.raises(TimeoutError):
+            self.chat_service._run(slow(), timeout=0.05)
+        
+        assert cancelled.wait(timeout=5)
+
+    def test_stream_message_yields_chunks(self):
+        """Test that stream_message relays agent chunks in order."""
+        async def fake_stream(user_id, message):
+            for chunk in ["Repository ", "analysis ", "complete"]:
+                yield chunk
+        
+        self.chat_service.agent_facade = Mock()
+        self.chat_service.agent_facade.stream = fake_stream
+        
+        chunks = list(self.chat_service.stream_message("test_user", "Tell me about repo"))
+        
+        assert chunks == ["Repository ", "analysis ", "complete"]
+
+    def test_stream_message_handles_exception(self):
+        """Test that a failing agent stream ends with a fallback message."""
+        async def failing_stream(user_id, message):
+            yield "Partial "
+            raise RuntimeError("Unexpected error")
+        
+        self.chat_service.agent_facade = Mock()
+        self.chat_service.agent_facade.stream = failing_stream
+        
+        chunks = list(self.chat_service.stream_message("test_user", "Tell me about repo"))
+        
+        assert chunks[0] == "Partial "
+        assert "trouble processing" in chunks[-1].lower()
+
+    def test_stream_message_disconnect_cancels_run(self):
+        """Test that closing the stream, as Flask does on client disconnect, cancels the agent run."""
+        cancelled = threading.Event()
+
+        async def endless_stream(user_id, message):
+            yield "Partial "
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        self.chat_service.agent_facade = Mock()
+        self.chat_service.agent_facade.stream = endless_stream
+
+        stream = self.chat_service.stream_message("test_user", "Tell me about repo")
+        assert next(stream) == "Partial "
+        stream.close()
+
+        assert cancelled.wait(2)
+
+    def test_stream_message_times_out_waiting_for_chunk(self):
+        """Test that a stalled agent stream ends with a timeout reply and is cancelled."""
+        cancelled = threading.Event()
+
+        async def stalled_stream(user_id, message):
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            yield "never"
+
+        self.chat_service.agent_facade = Mock()
+        self.chat_service.agent_facade.stream = stalled_stream
+        self.chat_service._api_request_timeout = 0.2
+
+        chunks = list(self.chat_service.stream_message("test_user", "Tell me about repo"))
+
+        assert len(chunks) == 1
+        assert "timed out" in chunks[0]
+        assert cancelled.wait(2)
+
     def test_get_history_placeholder(self):
         """Test that get_history returns empty list (placeholder implementation)."""
         result = self.chat_service.get_history("test_user")
@@ -180,29 +315,86 @@ class TestChatService:
             assert result == "Generated error response"
             mock_llm.ainvoke.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_generate_error_response_skips_llm_for_known_errors(self):
+        """Test that a known error cause gets a static reply without creating an LLM client."""
+        with patch('app.agent.llm_client.LLMClient') as mock_llm_client:
+            result = await self.chat_service._generate_error_response("Request was cancelled or interrupted", "Hi")
+        
+        assert "interrupted" in result.lower()
+        mock_llm_client.assert_not_called()
+
+    def test_warm_up_starts_facade_on_persistent_loop(self):
+        """Test that warm_up runs the facade start on the persistent loop."""
+        loops = []
+        
+        async def record_start():
+            loops.append(asyncio.get_running_loop())
+        
+        self.chat_service.agent_facade = Mock()
+        self.chat_service.agent_facade.start = record_start
+        
+        self.chat_service.warm_up().result(timeout=5)
+        
+        assert loops == [self.chat_service._event_loop]
+
     def test_cleanup_preserves_event_loop(self):
         """Test that cleanup preserves the persistent event loop."""
-        # Mock event loop
-        mock_loop = Mock()
-        mock_loop.is_closed.return_value = False
-        self.chat_service._event_loop = mock_loop
-        
-        with patch.object(self.chat_service.agent_facade, 'close_resources', new_callable=AsyncMock):
+        with patch.object(self.chat_service.agent_facade, 'close_resources', new_callable=AsyncMock) as mock_close:
             self.chat_service.cleanup()
             
+            mock_close.assert_called_once()
             # Event loop should still be available
-            assert hasattr(self.chat_service, '_event_loop')
-            assert self.chat_service._event_loop == mock_loop
+            assert self.chat_service._event_loop.is_running()
+            assert not self.chat_service._event_loop.is_closed()
 
     def test_shutdown_closes_event_loop(self):
-        """Test that shutdown closes the persistent event loop."""
-        # Mock event loop
-        mock_loop = Mock()
-        mock_loop.is_closed.return_value = False
-        self.chat_service._event_loop = mock_loop
-        
-        with patch.object(self.chat_service.agent_facade, 'close_resources', new_callable=AsyncMock):
-            self.chat_service.shutdown()
-            
-            # Event loop should be closed
-            mock_loop.close.assert_called_once()
+        """Test that shutdown stops and closes the persistent event loop."""
+        self.chat_service._run(asyncio.sleep(0))
+        self.chat_service.shutdown()
+        
+        assert not self.chat_service._loop_thread.is_alive()
+        assert self.chat_service._event_loop.is_closed()
+
+    def test_requests_share_event_loop(self):
+        """Test that consecutive requests run on the same persistent event loop."""
+        loops = []
+        
+        async def record_loop(user_id, message):
+            loops.append(asyncio.get_running_loop())
+            return AgentResponse(success=True, message="ok", history=[("user", message), ("assistant", "ok")])
+        
+        self.chat_service.agent_facade = Mock()
+        self.chat_service.agent_facade.invoke = record_loop
+        
+        self.chat_service.process_message("test_user", "first")
+        self.chat_service.process_message("test_user", "second")
+        
+        assert loops == [self.chat_service._event_loop, self.chat_service._event_loop]
+
+    def test_event_loop_started_lazily(self):
+        """Test that building the service does not start the loop thread; the first request does."""
+        assert self.chat_service._loop_thread is None
+        
+        self.chat_service._run(asyncio.sleep(0))
+        
+        assert self.chat_service._loop_thread.is_alive()
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_forked_process_gets_its_own_loop(self):
+        """Test that a process forked after the loop started can still run requests, as the launcher does."""
+        async def pong():
+            return "pong"
+        
+        assert self.chat_service._run(pong(), timeout=5) == "pong"
+        
+        pid = os.fork()
+        if pid == 0:
+            ok = False
+            try:
+                ok = self.chat_service._run(pong(), timeout=5) == "pong"
+            finally:
+                os._exit(0 if ok else 1)
+        _, status = os.waitpid(pid, 0)
+        
+        assert os.waitstatus_to_exitcode(status) == 0
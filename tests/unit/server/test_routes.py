@@ -83,6 +83,46 @@ class TestServerRoutes:
         assert "success" in data
         assert not data["success"]
 
+    def test_chat_endpoint_streams_sse(self, client):
+        """Test that stream=true returns the reply as server-sent events."""
+        from app.server.routes import chat_service
+        
+        chat_service.stream_message = Mock(return_value=iter(["Recent ", "commits"]))
+        
+        response = client.post('/api/chat', 
+                             data=json.dumps({
+                                 "user_id": "test_user",
+                                 "message": "What are recent changes in owner/repo?",
+                                 "stream": True
+                             }),
+                             content_type='application/json')
+        
+        assert response.status_code == 200
+        assert response.mimetype == "text/event-stream"
+        events = [line[len("data: "):] for line in response.get_data(as_text=True).split("\n\n") if line]
+        assert [json.loads(event)["delta"] for event in events[:-1]] == ["Recent ", "commits"]
+        assert events[-1] == "[DONE]"
+
+    def test_chat_endpoint_unavailable_uses_temporary_service_loop(self):
+        """Test that the 503 reply runs on the temporary service's loop and shuts it down."""
+        from app.server.routes import app
+        app.config['TESTING'] = True
+        temp_service = Mock()
+        temp_service._run.return_value = "Chat is offline for maintenance."
+        
+        with patch('app.server.routes.chat_service', None), \
+                patch('app.server.chat.ChatService', return_value=temp_service):
+            response = app.test_client().post('/api/chat',
+                                              data=json.dumps({"user_id": "test_user", "message": "test"}),
+                                              content_type='application/json')
+        
+        assert response.status_code == 503
+        assert json.loads(response.data)["error"] == "Chat is offline for maintenance."
+        temp_service._run.assert_called_once()
+        temp_service._run.call_args[0][0].close()
+        temp_service.cleanup.assert_called_once()
+        temp_service.shutdown.assert_called_once()
+
     def test_health_endpoint(self, client):
         """Test health check endpoint."""
         response = client.get('/api/health')
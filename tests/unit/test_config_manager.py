@@ -155,3 +155,19 @@ class TestConfigManager:
                 config_manager = ConfigManager()
                 
                 assert config_manager.get("llm_model") == "keys_model"
+
+    def test_config_manager_env_override_set_after_load(self):
+        """Test that env overrides set after construction are still honoured, as the launcher does for TEST_MODE."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = os.path.join(temp_dir, "config.yaml")
+            with open(config_file, 'w') as f:
+                yaml.dump({"test_mode": False, "api_port": 5002}, f)
+
+            with patch('os.path.dirname') as mock_dirname:
+                mock_dirname.return_value = temp_dir
+                config_manager = ConfigManager()
+
+            with patch.dict(os.environ, {"TEST_MODE": "true"}):
+                assert config_manager.get("test_mode") is True
+                assert config_manager.get("llm_model") == "qwen3:8b"
+            assert config_manager.get("api_port") == 5002
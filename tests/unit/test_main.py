@@ -0,0 +1,27 @@
+import pytest
+
+# Mark all tests in this file as unit tests (fast with mocking)
+pytestmark = pytest.mark.unit
+import socket
+
+from app.main import wait_for_port
+
+
+class TestWaitForPort:
+    """Test cases for the API readiness poll used by the all-in-one launcher."""
+
+    def test_returns_once_port_accepts(self):
+        """Test that a listening port is reported ready."""
+        with socket.socket() as server:
+            server.bind(("127.0.0.1", 0))
+            server.listen()
+
+            assert wait_for_port("127.0.0.1", server.getsockname()[1], timeout=1.0)
+
+    def test_gives_up_after_timeout(self):
+        """Test that a closed port is reported not ready once the timeout passes."""
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+
+        assert not wait_for_port("127.0.0.1", port, timeout=0.2)
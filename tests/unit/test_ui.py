@@ -164,6 +164,53 @@ class TestAquariusUI:
         assert result[-1]["role"] == "assistant"
         assert "Request Error" in result[-1]["content"]
 
+    @patch('app.ui.requests.post')
+    def test_stream_assistant_response_yields_growing_reply(self, mock_post):
+        """Test that streamed deltas are shown as they arrive, with thinking blocks hidden."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.iter_lines.return_value = iter([
+            'data: {"delta": "<think>planning"}', "",
+            'data: {"delta": "</think>Recent "}', "",
+            'data: {"delta": "commits"}', "",
+            "data: [DONE]",
+        ])
+        mock_post.return_value.__enter__.return_value = mock_response
+        chat_history = [{"role": "user", "content": "Tell me about repo"}]
+        
+        updates = list(AquariusUI.stream_assistant_response(chat_history))
+        
+        assert mock_post.call_args.kwargs["json"]["stream"] is True
+        assert [state[-1]["content"] for state, ui in updates] == ["Recent", "Recent commits", "Recent commits"]
+        assert all(state == ui and len(state) == 2 for state, ui in updates)
+
+    @patch('app.ui.requests.post')
+    def test_stream_assistant_response_sends_session_id(self, mock_post):
+        """Test that each browser session talks to its own agent thread."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.iter_lines.return_value = iter(["data: [DONE]"])
+        mock_post.return_value.__enter__.return_value = mock_response
+        session_id = AquariusUI.new_session_id()
+        
+        list(AquariusUI.stream_assistant_response([{"role": "user", "content": "Hi"}], session_id))
+        
+        assert mock_post.call_args.kwargs["json"]["user_id"] == session_id
+        assert session_id != AquariusUI.new_session_id()
+
+    @patch('app.ui.requests.post')
+    def test_stream_assistant_response_api_error(self, mock_post):
+        """Test that a failed streaming request shows the API error."""
+        mock_response = MagicMock()
+        mock_response.status_code = 503
+        mock_response.text = "Service unavailable"
+        mock_post.return_value.__enter__.return_value = mock_response
+        
+        updates = list(AquariusUI.stream_assistant_response([{"role": "user", "content": "Hi"}]))
+        
+        assert len(updates) == 1
+        assert "API Error 503" in updates[0][0][-1]["content"]
+
     def test_get_assistant_response_no_user_message(self):
         """Test assistant response when no user message found."""
         chat_history = [